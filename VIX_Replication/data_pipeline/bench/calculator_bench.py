@@ -0,0 +1,130 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from ..compute.calculator import (
+    calc_K0,
+    construct_dataframe,
+    calc_contribution,
+    compute_vix_from_dataframes,
+)
+from ..compute.vector_calculator import compute_vix_vectorized
+from .synthetic import synthetic_chain
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+
+DEFAULT_STRIKES = (50, 200, 1000, 5000)
+SEEDS = (0, 1, 2)
+
+M_CM = 30
+R1, R2 = 0.04, 0.041
+RTOL = 1e-9
+
+RESULT_KEYS = ("vix", "variance_near", "variance_next")
+
+def _copies(chain):
+    return [df.copy() for df in chain]
+
+def _time(fn, make_args, repeat):
+    # argument copies are made outside the timed region because the
+    # pandas calculator writes helper columns into its inputs
+    best = float("inf")
+    for _ in range(repeat):
+        args = make_args()
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def bench_chain(chain, repeat):
+    call_near, put_near, call_next, put_next = chain
+    T1 = call_near["dte"].iloc[0] / 365
+    T2 = call_next["dte"].iloc[0] / 365
+
+    fwd_near, fwd_next, K0_near, K0_next = calc_K0(*_copies(chain), R1, R2, T1, T2)
+    df_near, df_next = construct_dataframe(*_copies(chain), K0_near, K0_next)
+
+    return {
+        "calc_K0": _time(
+            calc_K0, lambda: (*_copies(chain), R1, R2, T1, T2), repeat),
+        "construct_dataframe": _time(
+            construct_dataframe, lambda: (*_copies(chain), K0_near, K0_next), repeat),
+        "calc_contribution": _time(
+            calc_contribution, lambda: (df_near.copy(), df_next.copy(), R1, R2, T1, T2), repeat),
+        "compute_vix_from_dataframes": _time(
+            compute_vix_from_dataframes, lambda: (*_copies(chain), None, M_CM, R1, R2), repeat),
+        "compute_vix_vectorized": _time(
+            compute_vix_vectorized, lambda: (*chain, None, M_CM, R1, R2), repeat),
+    }
+
+def check_drift(name, results, baseline):
+    failures = []
+    expected = baseline.get(name)
+    if expected is None:
+        return [f"{name}: no baseline entry"]
+
+    for engine, result in results.items():
+        for key in RESULT_KEYS:
+            want = expected[key]
+            got = result[key]
+            if abs(got - want) > RTOL * max(1.0, abs(want)):
+                failures.append(f"{name} {engine} {key}: {got!r} != baseline {want!r}")
+
+    return failures
+
+def run_benchmarks(strikes=DEFAULT_STRIKES, repeat=5, update_baseline=False, baseline_path=BASELINE_PATH):
+    baseline = {}
+    if baseline_path.exists() and not update_baseline:
+        baseline = json.loads(baseline_path.read_text())
+
+    new_baseline = {}
+    failures = []
+
+    print(f"{'strikes':>8} {'stage':<28} {'best ms':>10} {'chains/s':>10}")
+
+    for n in strikes:
+        timings = {}
+
+        for seed in SEEDS:
+            chain = synthetic_chain(n, seed=seed)
+            name = f"n{n}_s{seed}"
+
+            results = {
+                "pandas": compute_vix_from_dataframes(*_copies(chain), None, M_CM, R1, R2),
+                "vectorized": compute_vix_vectorized(*chain, None, M_CM, R1, R2),
+            }
+            new_baseline[name] = {k: results["pandas"][k] for k in RESULT_KEYS}
+
+            if not update_baseline:
+                failures.extend(check_drift(name, results, baseline))
+
+            for stage, t in bench_chain(chain, repeat).items():
+                timings.setdefault(stage, []).append(t)
+
+        for stage, ts in timings.items():
+            t = sum(ts) / len(ts)
+            print(f"{n:>8} {stage:<28} {t * 1e3:>10.3f} {1 / t:>10.1f}")
+
+    if update_baseline:
+        baseline_path.write_text(json.dumps(new_baseline, indent=2, sort_keys=True) + "\n")
+        print(f"[BASELINE] written to {baseline_path}")
+
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--strikes", "-n", type=int, nargs="+", default=list(DEFAULT_STRIKES))
+    parser.add_argument("--repeat", "-r", type=int, default=5)
+    parser.add_argument("--update-baseline", action="store_true")
+
+    args = parser.parse_args()
+
+    failures = run_benchmarks(args.strikes, args.repeat, args.update_baseline)
+
+    for f in failures:
+        print(f"[DRIFT] {f}")
+
+    sys.exit(1 if failures else 0)
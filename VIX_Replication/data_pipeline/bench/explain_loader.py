@@ -0,0 +1,89 @@
+import argparse
+import json
+import sys
+from datetime import datetime
+from sqlalchemy import text, func, select
+from sqlalchemy.dialects import postgresql
+
+from ..db.engine import SessionLocal
+from ..models.option_quotes import OptionQuote
+from ..compute.loader import day_chain_stmt
+from ..compute.updater import VIX_INDEX_CONFIG
+
+EXPECTED_NODE = "Index Only Scan"
+EXPECTED_INDEX = "idx_quote_loader"
+
+def _scan_nodes(plan):
+    if "Relation Name" in plan or "Index Name" in plan:
+        yield plan
+    for child in plan.get("Plans", []):
+        yield from _scan_nodes(child)
+
+def index_ancestors(session, name):
+    # On the partitioned layout EXPLAIN names each partition's own index;
+    # pg_partition_ancestors maps it back to the parent (itself included)
+    return set(session.execute(
+        text("SELECT relid::regclass::text FROM pg_partition_ancestors(to_regclass(:name))"),
+        {"name": name},
+    ).scalars())
+
+def explain_loader(session, symbol, trade_date, term_groups):
+    stmt = day_chain_stmt(symbol, trade_date, term_groups)
+    sql = stmt.compile(
+        dialect=postgresql.dialect(),
+        compile_kwargs={"literal_binds": True},
+    )
+
+    plan = session.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}")).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    return plan[0]
+
+def check_plan(session, plan):
+    failures = []
+    resolved = {}
+
+    for node in _scan_nodes(plan["Plan"]):
+        kind = node["Node Type"]
+        index = node.get("Index Name")
+        print(
+            f"{kind:<20} index={index} rows={node.get('Actual Rows')} "
+            f"heap_fetches={node.get('Heap Fetches')} "
+            f"shared_hit={node.get('Shared Hit Blocks')} shared_read={node.get('Shared Read Blocks')}"
+        )
+
+        if index is not None and index not in resolved:
+            resolved[index] = index_ancestors(session, index)
+
+        if kind != EXPECTED_NODE or EXPECTED_INDEX not in resolved.get(index, ()):
+            failures.append(f"{kind} on {index or node.get('Relation Name')}")
+
+    print(f"execution {plan['Execution Time']:.3f} ms")
+    return failures
+
+def parse_date(d):
+    return datetime.strptime(d, "%Y-%m-%d").date()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbol", "-s", required=True)
+    parser.add_argument("--date", "-d", type=parse_date)
+    parser.add_argument("--index-type", "-i", default="VIX")
+
+    args = parser.parse_args()
+
+    with SessionLocal() as session:
+        trade_date = args.date or session.scalar(
+            select(func.max(OptionQuote.trade_date)).where(OptionQuote.symbol == args.symbol)
+        )
+
+        print(f"[EXPLAIN] loader {args.symbol} {trade_date} {args.index_type}")
+        plan = explain_loader(session, args.symbol, trade_date, VIX_INDEX_CONFIG[args.index_type]["term_groups"])
+        failures = check_plan(session, plan)
+
+    for f in failures:
+        print(f"[PLAN] expected {EXPECTED_NODE} on {EXPECTED_INDEX}, got {f}")
+
+    sys.exit(1 if failures else 0)
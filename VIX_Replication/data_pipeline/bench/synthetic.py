@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+from scipy.special import ndtr
+
+TICK = 0.05
+
+def _bs_prices(spot, strikes, T, r, vol):
+    sd = vol * np.sqrt(T)
+    d1 = (np.log(spot / strikes) + (r + 0.5 * vol ** 2) * T) / sd
+    d2 = d1 - sd
+    call = spot * ndtr(d1) - strikes * np.exp(-r * T) * ndtr(d2)
+    put = strikes * np.exp(-r * T) * ndtr(-d2) - spot * ndtr(-d1)
+    return call, put
+
+def _quotes(theo, rng, zero_bid_prob):
+    half_spread = np.maximum(TICK, 0.02 * theo) / 2
+    bid = np.floor((theo - half_spread) / TICK) * TICK
+    ask = np.ceil((theo + half_spread) / TICK) * TICK
+
+    # far OTM strikes trade at a zero bid, plus some random holes
+    bid[theo < TICK] = 0.0
+    bid[rng.random(theo.size) < zero_bid_prob] = 0.0
+    bid = np.maximum(bid, 0.0)
+    ask = np.maximum(ask, bid + TICK)
+
+    return bid, ask, (bid + ask) / 2
+
+def synthetic_term(
+    n_strikes: int,
+    dte: int,
+    spot: float = 4500.0,
+    r: float = 0.04,
+    atm_vol: float = 0.18,
+    skew: float = -0.6,
+    zero_bid_prob: float = 0.02,
+    missing_prob: float = 0.01,
+    seed: int = 0,
+):
+    '''
+    Quotes for one expiry as a single frame (calls then puts, cp column):
+    a shared strike grid with a skewed smile, zero-bid wings and a few
+    strikes missing on one side.
+    '''
+    rng = np.random.default_rng(seed)
+    T = dte / 365
+
+    width = 4 * atm_vol * np.sqrt(max(T, 1 / 365)) + 0.3
+    lo, hi = spot * max(0.05, 1 - width), spot * (1 + width / 2)
+    step = max(1.0, round((hi - lo) / n_strikes))
+    strikes = lo - lo % step + step * np.arange(n_strikes)
+
+    moneyness = np.log(strikes / spot)
+    vol = np.clip(atm_vol + skew * moneyness + 0.8 * moneyness ** 2, 0.05, 2.0)
+
+    call_theo, put_theo = _bs_prices(spot, strikes, T, r, vol)
+
+    frames = []
+    for cp, theo in (("C", call_theo), ("P", put_theo)):
+        bid, ask, mid = _quotes(theo, rng, zero_bid_prob)
+        df = pd.DataFrame(dict(cp=cp, strike=strikes, bid=bid, ask=ask, mid=mid, dte=dte))
+        keep = rng.random(n_strikes) >= missing_prob
+        frames.append(df[keep])
+
+    return pd.concat(frames, ignore_index=True)
+
+def synthetic_chain(n_strikes: int, near_dte: int = 23, next_dte: int = 37, seed: int = 0, **kwargs):
+    # One frame for the day, sliced like loader.split_chain, so call and put
+    # frames carry disjoint index labels exactly as loader output does
+    df = pd.concat([
+        synthetic_term(n_strikes, near_dte, seed=seed, **kwargs).assign(term_group="near"),
+        synthetic_term(n_strikes, next_dte, seed=seed + 1, **kwargs).assign(term_group="next"),
+    ], ignore_index=True)
+
+    return tuple(
+        df[(df.term_group == group) & (df.cp == cp)]
+        for group in ("near", "next")
+        for cp in ("C", "P")
+    )
@@ -0,0 +1,168 @@
+import pandas as pd
+from datetime import date
+from sqlalchemy import select
+
+from ..db.engine import engine
+
+from .loader import quote_source
+from .vector_calculator import compute_vix_vectorized
+from .rate_store import RateStore
+from .staleness import record_input_state_rows
+from .updater import VIX_INDEX_CONFIG, upsert_vix_many, record_vix_failures
+
+STREAM_BATCH_ROWS = 50_000
+WRITE_CHUNK_ROWS = 1_000
+
+CHAIN_COLUMNS = ["trade_date", "term_group", "cp", "strike", "bid", "mid", "dte"]
+
+def iter_day_chains(
+        conn,
+        symbol: str,
+        term_groups: tuple[str, ...] | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        columns: list[str] = CHAIN_COLUMNS,
+):
+    '''
+    Streams the quote source for a symbol through a server-side cursor and
+    yields (trade_date, DataFrame) one day at a time.
+    '''
+    src = quote_source()
+
+    stmt = (
+        select(*[src.c[c] for c in columns])
+        .where(
+            src.c.symbol == symbol,
+            src.c.cp.in_(['C', 'P']),
+        )
+        .order_by(src.c.trade_date)
+    )
+    if term_groups is not None:
+        stmt = stmt.where(src.c.term_group.in_(term_groups))
+    if start_date is not None:
+        stmt = stmt.where(src.c.trade_date >= start_date)
+    if end_date is not None:
+        stmt = stmt.where(src.c.trade_date <= end_date)
+
+    result = conn.execution_options(
+        stream_results=True, yield_per=STREAM_BATCH_ROWS
+    ).execute(stmt)
+
+    carry = None
+    for part in result.partitions():
+        buf = pd.DataFrame(part, columns=columns)
+        if carry is not None:
+            buf = pd.concat([carry, buf], ignore_index=True)
+
+        # the last date of the batch may continue into the next one
+        last = buf["trade_date"].iloc[-1]
+        carry = buf[buf["trade_date"] == last]
+
+        for d, day in buf[buf["trade_date"] != last].groupby("trade_date", sort=True):
+            yield d, day
+
+    if carry is not None and not carry.empty:
+        yield carry["trade_date"].iloc[0], carry
+
+def compute_day_vix(symbol, trade_date, day, index_type, rates: RateStore):
+    cfg = VIX_INDEX_CONFIG[index_type]
+    near_group, next_group = cfg["term_groups"]
+
+    near = day[day.term_group == near_group]
+    nxt = day[day.term_group == next_group]
+
+    call_near, put_near = near[near.cp == "C"], near[near.cp == "P"]
+    call_next, put_next = nxt[nxt.cp == "C"], nxt[nxt.cp == "P"]
+
+    if call_near.empty or call_next.empty:
+        return None
+
+    # RateStore builds the spline once per curve date, shared by every index type
+    r1, r2 = rates.rates_for(trade_date, [call_near["dte"].iloc[0], call_next["dte"].iloc[0]])
+
+    result = compute_vix_vectorized(
+        call_near=call_near,
+        put_near=put_near,
+        call_next=call_next,
+        put_next=put_next,
+        trade_date=trade_date,
+        r1=float(r1),
+        r2=float(r2),
+        M_CM=cfg["M_CM"],
+    )
+
+    return dict(
+        symbol=symbol,
+        trade_date=trade_date,
+        index_type=index_type,
+        vix_value=result["vix"],
+        variance_near=result["variance_near"],
+        variance_next=result["variance_next"],
+        t_near=result["t_near"],
+        t_next=result["t_next"],
+    )
+
+def run_vix_history_batch(
+    symbol: str,
+    index_types: tuple[str, ...] = ("VIX", "VIX3M"),
+    start_date: date | None = None,
+    end_date: date | None = None,
+    chunk_size: int = WRITE_CHUNK_ROWS,
+    store=None,
+):
+    for index_type in index_types:
+        if index_type not in VIX_INDEX_CONFIG:
+            raise ValueError(f"Unknown index_type: {index_type}")
+
+    term_groups = tuple(
+        g for t in index_types for g in VIX_INDEX_CONFIG[t]["term_groups"]
+    )
+
+    print(f"[RUN] batch {symbol} {list(index_types)} from {start_date} to {end_date}")
+
+    ok = 0
+    failed = 0
+    rows = []
+    fail_rows = []
+
+    with engine.connect() as read_conn, engine.connect() as write_conn:
+        rates = RateStore.load(read_conn, start_date, end_date)
+
+        if store is not None:
+            days = store.iter_day_chains(symbol, term_groups, start_date, end_date)
+        else:
+            days = iter_day_chains(read_conn, symbol, term_groups, start_date, end_date)
+
+        for d, day in days:
+            for index_type in index_types:
+                try:
+                    data = compute_day_vix(symbol, d, day, index_type, rates)
+                except ValueError as e:
+                    print(f"[FAIL] {symbol} {d} {index_type}: {e}")
+                    fail_rows.append(dict(symbol=symbol, trade_date=d, index_type=index_type, reason=str(e)))
+                    failed += 1
+                    continue
+
+                if data is None:
+                    print(f"[SKIP] {symbol} {d} {index_type} (missing option data)")
+                    fail_rows.append(dict(
+                        symbol=symbol, trade_date=d, index_type=index_type, reason="missing option data"))
+                    continue
+
+                rows.append(data)
+                ok += 1
+
+            if len(rows) + len(fail_rows) >= chunk_size:
+                upsert_vix_many(write_conn, rows)
+                record_input_state_rows(write_conn, rows)
+                record_vix_failures(write_conn, fail_rows)
+                write_conn.commit()
+                rows = []
+                fail_rows = []
+
+        upsert_vix_many(write_conn, rows)
+        record_input_state_rows(write_conn, rows)
+        record_vix_failures(write_conn, fail_rows)
+        write_conn.commit()
+
+    print(f"[DONE] batch {symbol} | ok={ok}, failed={failed}")
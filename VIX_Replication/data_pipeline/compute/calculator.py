@@ -1,6 +1,13 @@
 import numpy as np
 import pandas as pd
 
+from .diagnostics import make_timer
+
+def _put_mid_by_strike(call_data, put_data):
+    # Put mid at each call's strike (NaN where no put is quoted), on the call index
+    put_mid = put_data.drop_duplicates('strike').set_index('strike')['mid']
+    return call_data['strike'].map(put_mid)
+
 def calc_K0(call_data_near_term, put_data_near_term, call_data_next_term, put_data_next_term, r1, r2, T1, T2):
     '''
     call_data_near_term['diff'] = abs(call_data_near_term['mid'] - put_data_near_term['mid'])
@@ -8,14 +15,18 @@ def calc_K0(call_data_near_term, put_data_near_term, call_data_next_term, put_da
     '''
     
     # Filter rows where both prices are not zero
-    valid_near_term = (call_data_near_term['mid'] != 0) & (put_data_near_term['mid'] != 0)
+    # Puts are matched to calls by strike, not by index label: loader frames
+    # come from one query, so call and put labels never line up
+    put_mid_near_term = _put_mid_by_strike(call_data_near_term, put_data_near_term)
+    valid_near_term = (call_data_near_term['mid'] != 0) & (put_mid_near_term != 0) & put_mid_near_term.notna()
     call_data_near_term['diff'] = float('inf')  # Initialize with a high value to exclude invalid rows
-    call_data_near_term.loc[valid_near_term, 'diff'] = abs(call_data_near_term.loc[valid_near_term, 'mid'] - put_data_near_term.loc[valid_near_term, 'mid'])
+    call_data_near_term.loc[valid_near_term, 'diff'] = abs(call_data_near_term.loc[valid_near_term, 'mid'] - put_mid_near_term[valid_near_term])
     
     # Filter rows where both prices are not zero for next term
-    valid_next_term = (call_data_next_term['mid'] != 0) & (put_data_next_term['mid'] != 0)
+    put_mid_next_term = _put_mid_by_strike(call_data_next_term, put_data_next_term)
+    valid_next_term = (call_data_next_term['mid'] != 0) & (put_mid_next_term != 0) & put_mid_next_term.notna()
     call_data_next_term['diff'] = float('inf')  # Initialize with a high value to exclude invalid rows
-    call_data_next_term.loc[valid_next_term, 'diff'] = abs(call_data_next_term.loc[valid_next_term, 'mid'] - put_data_next_term.loc[valid_next_term, 'mid'])
+    call_data_next_term.loc[valid_next_term, 'diff'] = abs(call_data_next_term.loc[valid_next_term, 'mid'] - put_mid_next_term[valid_next_term])
 
     strike_near_term = call_data_near_term.loc[call_data_near_term[call_data_near_term['diff'] != 0]['diff'].idxmin(), 'strike']
     strike_next_term = call_data_next_term.loc[call_data_next_term[call_data_next_term['diff'] != 0]['diff'].idxmin(), 'strike']
@@ -203,36 +214,53 @@ def compute_vix_from_dataframes(
     M_CM,
     r1=0.0,
     r2=0.0,
+    diagnostics=None,
 ):
+    timer = make_timer(diagnostics)
+
     M_T1 = call_near["dte"].iloc[0]
     M_T2 = call_next["dte"].iloc[0]
     T1 = M_T1 / 365
     T2 = M_T2 / 365
 
-    forward_near, forward_next, K0_near, K0_next = calc_K0(
-        call_near, put_near,
-        call_next, put_next,
-        r1, r2, T1, T2
-    )
-
-    df_near, df_next = construct_dataframe(
-        call_near, put_near,
-        call_next, put_next,
-        K0_near, K0_next
-    )
-
-    df_near, df_next = calc_contribution(df_near, df_next, r1, r2, T1, T2)
-
-    var_near, var_next = calc_total_contribution(df_near, df_next, T1, T2)
-    sigma1, sigma2 = calc_total_sigma(
-        var_near, var_next,
-        forward_near, forward_next,
-        K0_near, K0_next,
-        T1, T2
-    )
+    with timer.stage("calc_K0"):
+        forward_near, forward_next, K0_near, K0_next = calc_K0(
+            call_near, put_near,
+            call_next, put_next,
+            r1, r2, T1, T2
+        )
+
+    with timer.stage("construct_dataframe"):
+        df_near, df_next = construct_dataframe(
+            call_near, put_near,
+            call_next, put_next,
+            K0_near, K0_next
+        )
+
+    with timer.stage("calc_contribution"):
+        df_near, df_next = calc_contribution(df_near, df_next, r1, r2, T1, T2)
+
+        var_near, var_next = calc_total_contribution(df_near, df_next, T1, T2)
+        sigma1, sigma2 = calc_total_sigma(
+            var_near, var_next,
+            forward_near, forward_next,
+            K0_near, K0_next,
+            T1, T2
+        )
 
     vix = calc_vix(sigma1, sigma2, T1, T2, M_T1, M_T2, M_CM)
 
+    if diagnostics is not None:
+        diagnostics.setdefault("stages", {}).update(timer.stages)
+        diagnostics.update(
+            forward_near=float(forward_near),
+            forward_next=float(forward_next),
+            K0_near=float(K0_near),
+            K0_next=float(K0_next),
+            n_strikes_near=len(df_near),
+            n_strikes_next=len(df_next),
+        )
+
     return {
         "vix": float(vix),
         "variance_near": float(sigma1),
@@ -0,0 +1,126 @@
+import shutil
+import tempfile
+import pandas as pd
+from collections import OrderedDict
+from datetime import date
+from pathlib import Path
+from sqlalchemy.orm import Session
+
+from .loader import load_day_chain
+from .rates_adapter import load_rate_curve, build_rate_interpolator
+
+# Every term group used by VIX_INDEX_CONFIG, loaded together per day
+ALL_TERM_GROUPS = ("near30", "next30", "near90", "next90")
+
+DEFAULT_MAX_BYTES = 512 * 1024 ** 2
+
+class ChainCache:
+    '''
+    Memory-bounded LRU of whole-day chains keyed by (symbol, trade_date).
+
+    A day is loaded once with all term groups, so VIX and VIX3M share a
+    single read. Evicted days are written to spill_dir (if given) and read
+    back from local disk instead of the database. Each cache spills into its
+    own fresh subdirectory of spill_dir, so chains spilled by an earlier run
+    are never served after a re-ingest and caches sharing spill_dir cannot
+    touch each other's files. Rate curves are memoized per trade date alongside.
+
+    source, if given, replaces Postgres as the chain backend; anything with
+    load_day_chain(symbol, trade_date, term_groups) works, e.g.
+    store.parquet_store.ParquetChainStore.
+    '''
+
+    def __init__(
+            self,
+            max_bytes: int = DEFAULT_MAX_BYTES,
+            spill_dir: str | Path | None = None,
+            source=None,
+            rate_store=None,
+    ):
+        self.max_bytes = max_bytes
+        self.source = source
+        self.rate_store = rate_store
+        self.spill_dir = None
+        if spill_dir is not None:
+            Path(spill_dir).mkdir(parents=True, exist_ok=True)
+            self.spill_dir = Path(tempfile.mkdtemp(prefix="chain_cache_", dir=spill_dir))
+
+        self._chains = OrderedDict()
+        self._sizes = {}
+        self._bytes = 0
+        self._rates = {}
+        self._interpolators = {}
+
+        self.hits = 0
+        self.spill_hits = 0
+        self.misses = 0
+
+    def _spill_path(self, key):
+        symbol, trade_date = key
+        return self.spill_dir / f"{symbol}_{trade_date.isoformat()}.pkl"
+
+    def _insert(self, key, df):
+        size = int(df.memory_usage(deep=True).sum())
+        self._chains[key] = df
+        self._sizes[key] = size
+        self._bytes += size
+
+        while self._bytes > self.max_bytes and len(self._chains) > 1:
+            old_key, old_df = self._chains.popitem(last=False)
+            self._bytes -= self._sizes.pop(old_key)
+
+            if self.spill_dir is not None:
+                old_df.to_pickle(self._spill_path(old_key))
+
+    def get_chain(self, session: Session, symbol: str, trade_date: date):
+        key = (symbol, trade_date)
+
+        if key in self._chains:
+            self._chains.move_to_end(key)
+            self.hits += 1
+            return self._chains[key]
+
+        if self.spill_dir is not None and self._spill_path(key).exists():
+            df = pd.read_pickle(self._spill_path(key))
+            self.spill_hits += 1
+        elif self.source is not None:
+            df = self.source.load_day_chain(symbol, trade_date, ALL_TERM_GROUPS)
+            self.misses += 1
+        else:
+            df = load_day_chain(session, symbol, trade_date, ALL_TERM_GROUPS)
+            self.misses += 1
+
+        self._insert(key, df)
+        return df
+
+    def get_rate_curve(self, session: Session, trade_date: date):
+        if self.rate_store is not None:
+            return self.rate_store.curve(trade_date)
+        if trade_date not in self._rates:
+            self._rates[trade_date] = load_rate_curve(session, trade_date)
+        return self._rates[trade_date]
+
+    def rates_for(self, session: Session, trade_date: date, dtes):
+        if self.rate_store is not None:
+            return self.rate_store.rates_for(trade_date, dtes)
+        if trade_date not in self._interpolators:
+            self._interpolators[trade_date] = build_rate_interpolator(self.get_rate_curve(session, trade_date))
+        return self._interpolators[trade_date](dtes)
+
+    def clear(self):
+        self._chains.clear()
+        self._sizes.clear()
+        self._bytes = 0
+        self._rates.clear()
+        self._interpolators.clear()
+
+        if self.spill_dir is not None:
+            for p in self.spill_dir.glob("*.pkl"):
+                p.unlink()
+
+    def close(self):
+        # removes this cache's spill directory; later evictions are not spilled
+        self.clear()
+        if self.spill_dir is not None:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+            self.spill_dir = None
@@ -0,0 +1,52 @@
+import time
+from contextlib import contextmanager, nullcontext
+
+class StageTimer:
+    def __init__(self):
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - t0
+
+class _NullTimer:
+    # shared no-op context so disabled instrumentation allocates nothing
+    _ctx = nullcontext()
+
+    def stage(self, name):
+        return self._ctx
+
+NULL_TIMER = _NullTimer()
+
+def make_timer(diagnostics):
+    return StageTimer() if diagnostics is not None else NULL_TIMER
+
+def diagnostics_row(symbol, trade_date, index_type, diagnostics: dict):
+    stages = diagnostics.get("stages", {})
+
+    return dict(
+        symbol=symbol,
+        trade_date=trade_date,
+        index_type=index_type,
+        t_load=stages.get("load"),
+        t_rates=stages.get("rates"),
+        t_prepare=stages.get("prepare"),
+        t_calc_K0=stages.get("calc_K0"),
+        t_construct=stages.get("construct_dataframe"),
+        t_contribution=stages.get("calc_contribution"),
+        t_total=stages.get("total"),
+        forward_near=diagnostics.get("forward_near"),
+        forward_next=diagnostics.get("forward_next"),
+        k0_near=diagnostics.get("K0_near"),
+        k0_next=diagnostics.get("K0_next"),
+        n_strikes_near=diagnostics.get("n_strikes_near"),
+        n_strikes_next=diagnostics.get("n_strikes_next"),
+        put_cutoff_near=diagnostics.get("put_cutoff_near"),
+        call_cutoff_near=diagnostics.get("call_cutoff_near"),
+        put_cutoff_next=diagnostics.get("put_cutoff_next"),
+        call_cutoff_next=diagnostics.get("call_cutoff_next"),
+    )
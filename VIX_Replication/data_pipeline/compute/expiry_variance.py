@@ -0,0 +1,111 @@
+from datetime import date
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+
+from ..db.engine import engine
+from ..models.expiry_variance import ExpiryVariance
+
+from .batch import WRITE_CHUNK_ROWS, iter_day_chains
+from .rate_store import RateStore
+from .term_structure import DEFAULT_MATURITIES, calc_expiry_variances, interpolate_constant_maturity
+
+def upsert_expiry_variances(conn, rows: list[dict]):
+    if not rows:
+        return
+
+    stmt = insert(ExpiryVariance).values(rows)
+
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["symbol", "trade_date", "dte"],
+        set_={
+            "t": stmt.excluded.t,
+            "r": stmt.excluded.r,
+            "forward": stmt.excluded.forward,
+            "k0": stmt.excluded.k0,
+            "n_strikes": stmt.excluded.n_strikes,
+            "variance": stmt.excluded.variance,
+        }
+    )
+
+    conn.execute(stmt)
+
+def run_expiry_variance_history(
+    symbol: str,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    chunk_size: int = WRITE_CHUNK_ROWS,
+):
+    '''
+    Computes the variance of every stored expiry (not only the VIX term
+    groups) for each day in range. Useful after ingesting with
+    keep_all_expiries=True.
+    '''
+    print(f"[RUN] expiry variances {symbol} from {start_date} to {end_date}")
+
+    days = 0
+    rows = []
+
+    with engine.connect() as read_conn, engine.connect() as write_conn:
+        rates = RateStore.load(read_conn, start_date, end_date)
+
+        for d, day in iter_day_chains(read_conn, symbol, None, start_date, end_date):
+            try:
+                expiries = calc_expiry_variances(day, rates.curve(d))
+            except Exception as e:
+                print(f"[FAIL] {symbol} {d}: {e}")
+                continue
+
+            rows.extend(
+                dict(
+                    symbol=symbol,
+                    trade_date=d,
+                    dte=x["dte"],
+                    t=x["t"],
+                    r=x["r"],
+                    forward=x["forward"],
+                    k0=x["K0"],
+                    n_strikes=x["n_strikes"],
+                    variance=x["variance"],
+                )
+                for x in expiries
+            )
+            days += 1
+
+            if len(rows) >= chunk_size:
+                upsert_expiry_variances(write_conn, rows)
+                write_conn.commit()
+                rows = []
+
+        upsert_expiry_variances(write_conn, rows)
+        write_conn.commit()
+
+    print(f"[DONE] expiry variances {symbol} | days={days}")
+
+def load_expiry_variances(session: Session, symbol: str, trade_date: date):
+    rows = (
+        session.query(ExpiryVariance)
+        .filter(
+            ExpiryVariance.symbol == symbol,
+            ExpiryVariance.trade_date == trade_date,
+        )
+        .order_by(ExpiryVariance.dte)
+        .all()
+    )
+
+    return [
+        dict(dte=r.dte, t=r.t, r=r.r, forward=r.forward, K0=r.k0, n_strikes=r.n_strikes, variance=r.variance)
+        for r in rows
+    ]
+
+def term_structure_from_expiries(
+        session: Session,
+        symbol: str,
+        trade_date: date,
+        maturities=DEFAULT_MATURITIES,
+):
+    expiries = load_expiry_variances(session, symbol, trade_date)
+
+    return {
+        M_CM: interpolate_constant_maturity(expiries, M_CM)
+        for M_CM in maturities
+    }
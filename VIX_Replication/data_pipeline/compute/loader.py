@@ -1,33 +1,126 @@
+import io
+import os
 import pandas as pd
 from datetime import date
+from sqlalchemy import select, table, column
 from sqlalchemy.orm import Session
+from sqlalchemy.dialects import postgresql
 
+from ..db.pg_copy import copy_to_buffer
 from ..models.option_quotes import OptionQuote
 
-def load_option_data(
+# Only what the calculator reads; everything else stays in the database
+LOADER_COLUMNS = ("term_group", "cp", "dte", "strike", "bid", "mid")
+
+# Any table or view with option_quotes column names, e.g. option_quotes_compact_v
+# (synced from option_quotes by create_compact_tables --migrate, not by ingest,
+# so re-run the sync after ingesting before reading from it). Missing dates,
+# failure and staleness fingerprints are taken from the same source, so
+# switching it marks every tracked day stale once.
+QUOTE_SOURCE = os.getenv("QUOTE_SOURCE")
+
+COLUMN_DTYPES = {
+    "term_group": "category",
+    "cp": "category",
+    "dte": "int32",
+    "strike": "float64",
+    "bid": "float64",
+    "ask": "float64",
+    "mid": "float64",
+    "iv": "float64",
+    "delta": "float64",
+    "gamma": "float64",
+    "vega": "float64",
+    "theta": "float64",
+    "volume": "Int64",
+    "open_interest": "Int64",
+}
+
+def copy_select(session: Session, stmt, columns):
+    '''
+    Runs a Core select through COPY ... TO STDOUT and parses the CSV stream
+    straight into typed columns, so no per-row Python objects are built.
+    '''
+    sql = stmt.compile(
+        dialect=postgresql.dialect(),
+        compile_kwargs={"literal_binds": True},
+    )
+
+    buf = io.StringIO()
+    copy_to_buffer(session.connection(), f"COPY ({sql}) TO STDOUT WITH CSV", buf)
+
+    dtypes = {c: COLUMN_DTYPES.get(c, "object") for c in columns}
+    if buf.tell() == 0:
+        return pd.DataFrame({c: pd.Series(dtype=dtypes[c]) for c in columns})
+
+    buf.seek(0)
+    return pd.read_csv(buf, names=list(columns), dtype=dtypes)
+
+def quote_source(source: str | None = None):
+    source = source or QUOTE_SOURCE
+    if source is None:
+        return OptionQuote.__table__
+
+    return table(source, *[column(c.name, c.type) for c in OptionQuote.__table__.columns])
+
+def day_chain_stmt(
+        symbol: str,
+        trade_date: date,
+        term_groups: tuple[str, ...] | None = None,
+        columns: tuple[str, ...] = LOADER_COLUMNS,
+        source: str | None = None,
+):
+    src = quote_source(source)
+
+    stmt = (
+        select(*[src.c[c] for c in columns])
+        .where(
+            src.c.symbol == symbol,
+            src.c.trade_date == trade_date,
+            src.c.cp.in_(['C', 'P']),
+        )
+    )
+    if term_groups is not None:
+        stmt = stmt.where(src.c.term_group.in_(term_groups))
+
+    return stmt
+
+def load_day_chain(
         session: Session,
         symbol: str,
         trade_date: date,
-        term_groups: tuple[str, str],
+        term_groups: tuple[str, ...] | None = None,
+        extra_columns: tuple[str, ...] = (),
+        source: str | None = None,
 ):
+    columns = LOADER_COLUMNS + tuple(extra_columns)
+    stmt = day_chain_stmt(symbol, trade_date, term_groups, columns, source)
+
+    return copy_select(session, stmt, columns)
+
+def split_chain(df: pd.DataFrame, term_groups: tuple[str, str]):
     near_group, next_group = term_groups
 
-    rows = (
-        session.query(OptionQuote)
-        .filter(
-            OptionQuote.symbol == symbol,
-            OptionQuote.trade_date == trade_date,
-            OptionQuote.term_group.in_(term_groups),
-            OptionQuote.cp.in_(['C', 'P']),
-        ).all()
-    )
+    call_near = df[(df.term_group == near_group) & (df.cp == "C")]
+    put_near  = df[(df.term_group == near_group) & (df.cp == "P")]
+    call_next = df[(df.term_group == next_group) & (df.cp == "C")]
+    put_next  = df[(df.term_group == next_group) & (df.cp == "P")]
 
-    df = pd.DataFrame([r.__dict__ for r in rows])
-    df = df.drop(columns=["_sa_instance_state"])
+    return call_near, put_near, call_next, put_next
 
-    call_near = df[(df.term_group == near_group) & (df.cp == "C")].copy()
-    put_near  = df[(df.term_group == near_group) & (df.cp == "P")].copy()
-    call_next = df[(df.term_group == next_group) & (df.cp == "C")].copy()
-    put_next  = df[(df.term_group == next_group) & (df.cp == "P")].copy()
+def load_option_data(
+        session: Session,
+        symbol: str,
+        trade_date: date,
+        term_groups: tuple[str, str],
+        extra_columns: tuple[str, ...] = (),
+        cache=None,
+        source: str | None = None,
+):
+    # cached days hold LOADER_COLUMNS only
+    if cache is not None and not extra_columns:
+        df = cache.get_chain(session, symbol, trade_date)
+    else:
+        df = load_day_chain(session, symbol, trade_date, term_groups, extra_columns, source)
 
-    return call_near, put_near, call_next, put_next
\ No newline at end of file
+    return split_chain(df, term_groups)
@@ -0,0 +1,190 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, date
+from sqlalchemy.orm import Session
+
+from ..db.engine import SessionLocal, engine
+from ..utils import metrics
+from .rate_store import RateStore
+from .staleness import record_input_state, mark_stale_vix, get_stale_vix_dates
+from .updater import (
+    VIX_INDEX_CONFIG,
+    compute_single_day_vix,
+    get_missing_vix_dates,
+    record_vix_failures,
+    upsert_vix_many,
+)
+
+SHARDS_PER_WORKER = 4
+
+def _init_worker(collect_metrics: bool = False):
+    # Drop pooled connections inherited from the parent; the worker
+    # opens its own on first use.
+    engine.dispose(close=False)
+
+    # workers never export; each shard hands its metrics back to the parent
+    metrics.reset_metrics()
+    if collect_metrics:
+        metrics.enable_metrics()
+
+def _run_shard(symbol: str, index_type: str, dates: list[date]):
+    session: Session = SessionLocal()
+    outcomes = []
+    rows = []
+    fail_rows = []
+
+    try:
+        rate_store = RateStore.load(session, dates[0], dates[-1])
+
+        for d in dates:
+            try:
+                data = compute_single_day_vix(session, symbol, d, index_type, rate_store=rate_store)
+            except ValueError as e:
+                session.rollback()
+                outcomes.append((d, "FAIL", str(e)))
+                fail_rows.append(dict(symbol=symbol, trade_date=d, index_type=index_type, reason=str(e)))
+                continue
+            except Exception as e:
+                # not a verdict on the inputs: left unrecorded so the next run retries it
+                session.rollback()
+                outcomes.append((d, "ERROR", str(e)))
+                continue
+
+            if data is None:
+                outcomes.append((d, "SKIP", "missing option data"))
+                fail_rows.append(dict(symbol=symbol, trade_date=d, index_type=index_type, reason="missing option data"))
+                continue
+
+            rows.append(data)
+            outcomes.append((d, "OK", f"VIX={data['vix_value']:.3f}"))
+
+        upsert_vix_many(session, rows)
+        record_input_state(session, symbol, index_type, [r["trade_date"] for r in rows])
+        record_vix_failures(session, fail_rows)
+        session.commit()
+
+    except Exception as e:
+        # rate load or write failed: nothing from this shard was stored, so
+        # report every date and let the other shards finish
+        session.rollback()
+        outcomes = [(d, "ERROR", f"shard: {e}") for d in dates]
+
+    finally:
+        session.close()
+
+    return symbol, index_type, outcomes, metrics.drain()
+
+def shard_dates(dates: list[date], n_shards: int):
+    n_shards = max(1, min(n_shards, len(dates)))
+    size, extra = divmod(len(dates), n_shards)
+
+    shards = []
+    start = 0
+    for i in range(n_shards):
+        end = start + size + (1 if i < extra else 0)
+        shards.append(dates[start:end])
+        start = end
+
+    return shards
+
+def run_vix_history_parallel(
+    symbols: list[str],
+    index_types: list[str],
+    start_date: date | None = None,
+    end_date: date | None = None,
+    workers: int | None = None,
+    stale_only: bool = False,
+):
+    for index_type in index_types:
+        if index_type not in VIX_INDEX_CONFIG:
+            raise ValueError(f"Unknown index_type: {index_type}")
+
+    workers = workers or os.cpu_count() or 1
+
+    select_dates = get_stale_vix_dates if stale_only else get_missing_vix_dates
+
+    tasks = []
+    with SessionLocal() as session:
+        for symbol in symbols:
+            for index_type in index_types:
+                dates = select_dates(session, symbol, index_type, start_date, end_date)
+                print(f"[RUN] {symbol} {index_type} {len(dates)} dates")
+
+                if not dates:
+                    continue
+
+                for shard in shard_dates(dates, workers * SHARDS_PER_WORKER):
+                    tasks.append((symbol, index_type, shard))
+
+    if not tasks:
+        return {}
+
+    summary = {}
+
+    # map() yields in submission order, so the log is the same on every run
+    with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(metrics.metrics_enabled(),),
+    ) as pool:
+        for symbol, index_type, outcomes, collected in pool.map(_run_shard, *zip(*tasks)):
+            metrics.merge(collected)
+            counts = summary.setdefault((symbol, index_type), {"OK": 0, "SKIP": 0, "FAIL": 0, "ERROR": 0})
+
+            for d, status, msg in outcomes:
+                counts[status] += 1
+                print(f"[{status}] {symbol} {index_type} {d}  {msg}")
+
+    for (symbol, index_type), counts in summary.items():
+        print(
+            f"[DONE] {symbol} {index_type} | "
+            f"ok={counts['OK']}, skipped={counts['SKIP']}, "
+            f"failed={counts['FAIL']}, errors={counts['ERROR']}"
+        )
+
+    return summary
+
+
+def parse_date(d):
+    return datetime.strptime(d, "%Y-%m-%d").date()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", "-s", nargs="+", required=True)
+    parser.add_argument("--index-types", "-i", nargs="+", default=list(VIX_INDEX_CONFIG))
+    parser.add_argument("--start", "-t", type=parse_date)
+    parser.add_argument("--end", "-e", type=parse_date)
+    parser.add_argument("--workers", "-w", type=int)
+    parser.add_argument("--mark-stale", action="store_true")
+    parser.add_argument("--trust-untracked", action="store_true")
+    parser.add_argument("--stale-only", action="store_true")
+    parser.add_argument("--metrics-file")
+    parser.add_argument("--metrics-port", type=int)
+
+    args = parser.parse_args()
+
+    metrics.configure_from_env()
+    if args.metrics_file:
+        metrics.enable_metrics()
+    if args.metrics_port:
+        metrics.serve_metrics(args.metrics_port)
+
+    if args.mark_stale:
+        with engine.begin() as conn:
+            for symbol in args.symbols:
+                mark_stale_vix(conn, symbol, args.start, args.end, args.trust_untracked)
+
+    run_vix_history_parallel(
+        symbols=args.symbols,
+        index_types=args.index_types,
+        start_date=args.start,
+        end_date=args.end,
+        workers=args.workers,
+        stale_only=args.stale_only,
+    )
+
+    if args.metrics_file:
+        metrics.write_metrics(args.metrics_file)
+        print(f"[METRICS] written to {args.metrics_file}")
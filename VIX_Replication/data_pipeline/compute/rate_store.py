@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+from datetime import date, timedelta
+from sqlalchemy import select
+
+from ..models.rates import RiskFreeRate
+from .rates_adapter import MAX_LOOKBACK_DAYS, build_rate_interpolator
+
+class RateStore:
+    '''
+    risk_free_rates held in memory as a date x tenor matrix.
+
+    curve() answers the same as-of lookback as rates_adapter.load_rate_curve
+    (latest date within MAX_LOOKBACK_DAYS with any rows) with a binary
+    search instead of one query per day.
+    '''
+
+    def __init__(self, matrix: pd.DataFrame):
+        self.matrix = matrix.sort_index()
+        self._ordinals = np.array([d.toordinal() for d in self.matrix.index], dtype=np.int64)
+        self._curves = {}
+        self._interpolators = {}
+
+    @classmethod
+    def load(cls, session, start_date: date | None = None, end_date: date | None = None):
+        stmt = select(RiskFreeRate.trade_date, RiskFreeRate.tenor, RiskFreeRate.rate_bey)
+        if start_date is not None:
+            stmt = stmt.where(RiskFreeRate.trade_date >= start_date - timedelta(days=MAX_LOOKBACK_DAYS))
+        if end_date is not None:
+            stmt = stmt.where(RiskFreeRate.trade_date <= end_date)
+
+        df = pd.DataFrame(session.execute(stmt).all(), columns=["trade_date", "tenor", "rate_bey"])
+        matrix = df.pivot(index="trade_date", columns="tenor", values="rate_bey")
+
+        return cls(matrix)
+
+    def curve_date(self, trade_date: date):
+        i = np.searchsorted(self._ordinals, trade_date.toordinal(), side="right") - 1
+        if i < 0 or trade_date.toordinal() - self._ordinals[i] >= MAX_LOOKBACK_DAYS:
+            raise ValueError(
+                f"No risk-free rate data found within {MAX_LOOKBACK_DAYS} days "
+                f"before {trade_date}"
+            )
+        return self.matrix.index[i]
+
+    def curve(self, trade_date: date):
+        d = self.curve_date(trade_date)
+        if d not in self._curves:
+            self._curves[d] = self.matrix.loc[d].dropna()
+        return self._curves[d]
+
+    def rates_for(self, trade_date: date, dtes):
+        '''
+        Continuously compounded rates for many dtes at once; the spline is
+        built once per curve date and reused.
+        '''
+        d = self.curve_date(trade_date)
+        if d not in self._interpolators:
+            self._interpolators[d] = build_rate_interpolator(self.curve(trade_date))
+        return self._interpolators[d](dtes)
+
+    def get_rate_curve(self, session, trade_date: date):
+        return self.curve(trade_date)
@@ -3,7 +3,7 @@ import pandas as pd
 from datetime import timedelta
 
 from ..models.rates import RiskFreeRate
-from ..utils.rate_math import CMT_TENOR_DAYS, bey_to_cc_rate, bounded_cubic_spline
+from ..utils.rate_math import CMT_TENOR_DAYS, bey_to_cc_rate, bounded_cubic_spline, bounded_cubic_spline_vec
 
 MAX_LOOKBACK_DAYS = 5
 
@@ -28,7 +28,7 @@ def load_rate_curve(session, trade_date):
         f"before {trade_date}"
     )
 
-def compute_r_for_expiry(dte, rates_series):
+def _curve_knots(rates_series):
     curve = rates_series.dropna()
 
     df = (
@@ -44,15 +44,39 @@ def compute_r_for_expiry(dte, rates_series):
     x = df["days"].values.astype(float)
     y = df["rate"].values.astype(float)
 
+    return x, y
+
+def compute_r_for_expiry(dte, rates_series):
+    x, y = _curve_knots(rates_series)
+
     interp = bounded_cubic_spline(x, y)
     bey_t = interp(dte)
 
     return bey_to_cc_rate(bey_t)
 
-def compute_r1_r2(session, trade_date, dte1, dte2):
-    rates_series = load_rate_curve(session, trade_date)
+def build_rate_interpolator(rates_series):
+    '''
+    Builds the bounded spline once; the returned function maps an array of
+    dtes to continuously compounded rates.
+    '''
+    x, y = _curve_knots(rates_series)
+    interp = bounded_cubic_spline_vec(x, y)
+
+    def rates_for(dtes):
+        return bey_to_cc_rate(interp(dtes))
+
+    return rates_for
+
+def compute_r_for_expiries(dtes, rates_series):
+    return build_rate_interpolator(rates_series)(dtes)
 
-    r1 = compute_r_for_expiry(dte1, rates_series)
-    r2 = compute_r_for_expiry(dte2, rates_series)
+def compute_r1_r2(session, trade_date, dte1, dte2, cache=None, rate_store=None):
+    # one vectorized spline per curve; the store and the cache memoize it
+    if rate_store is not None:
+        r1, r2 = rate_store.rates_for(trade_date, [dte1, dte2])
+    elif cache is not None:
+        r1, r2 = cache.rates_for(session, trade_date, [dte1, dte2])
+    else:
+        r1, r2 = compute_r_for_expiries([dte1, dte2], load_rate_curve(session, trade_date))
 
     return float(r1), float(r2)
\ No newline at end of file
@@ -0,0 +1,185 @@
+import argparse
+import io
+import pandas as pd
+from sqlalchemy import text
+
+from ..db.engine import engine
+from ..db.pg_copy import copy_from_buffer
+from .rate_store import RateStore
+from .batch import WRITE_CHUNK_ROWS, iter_day_chains, compute_day_vix
+from .staleness import record_input_state
+from .updater import VIX_INDEX_CONFIG, record_vix_failures
+
+LIVE_TABLE = "vix_index_values"
+STAGING_TABLE = "vix_index_values_staging"
+
+VIX_COLUMNS = [
+    "symbol", "trade_date", "index_type", "vix_value",
+    "variance_near", "variance_next", "t_near", "t_next",
+]
+
+def create_staging_table(conn):
+    # Same columns and defaults (id keeps drawing from the live sequence),
+    # but no primary key or indexes while loading
+    conn.execute(text(f"DROP TABLE IF EXISTS {STAGING_TABLE}"))
+    conn.execute(text(f"CREATE TABLE {STAGING_TABLE} (LIKE {LIVE_TABLE} INCLUDING DEFAULTS)"))
+
+def copy_rows(conn, rows: list[dict]):
+    if not rows:
+        return
+
+    buf = io.StringIO()
+    pd.DataFrame(rows, columns=VIX_COLUMNS).to_csv(buf, header=False, index=False)
+    buf.seek(0)
+
+    # begin on the SQLAlchemy side so conn.commit() covers the COPY
+    if not conn.in_transaction():
+        conn.begin()
+
+    copy_from_buffer(conn, f"COPY {STAGING_TABLE} ({', '.join(VIX_COLUMNS)}) FROM STDIN WITH CSV", buf)
+
+def build_staging_indexes(conn):
+    conn.execute(text(f"ALTER TABLE {STAGING_TABLE} ADD CONSTRAINT {STAGING_TABLE}_pkey PRIMARY KEY (id)"))
+    conn.execute(text(
+        f"CREATE UNIQUE INDEX ix_vix_symbol_date_staging "
+        f"ON {STAGING_TABLE} (symbol, trade_date, index_type)"
+    ))
+
+# rows of vix_index_values (alias t) that the rebuild leaves untouched
+KEPT = "NOT (t.symbol = ANY(:symbols) AND t.index_type = ANY(:index_types))"
+
+def copy_kept_rows(conn, symbols: list[str], index_types: list[str]):
+    # Bulk carry-over of rows outside the rebuild, done without the lock;
+    # swap_staging_table only re-syncs what changed after this
+    return conn.execute(text(
+        f"INSERT INTO {STAGING_TABLE} SELECT * FROM {LIVE_TABLE} t WHERE {KEPT}"
+    ), {"symbols": list(symbols), "index_types": list(index_types)}).rowcount
+
+def swap_staging_table(conn, symbols: list[str], index_types: list[str], failed: list[dict] = ()):
+    '''
+    Runs in one transaction under an exclusive lock, so readers see either
+    the old table or the new one. Kept rows were copied beforehand; only
+    those changed or deleted since are re-synced here, then the tables swap.
+    failed: (symbol, trade_date, index_type) dicts inside the rebuild whose
+    recompute failed; their current live rows, if any, are carried forward.
+    '''
+    params = {"symbols": list(symbols), "index_types": list(index_types)}
+
+    conn.execute(text(f"LOCK TABLE {LIVE_TABLE} IN ACCESS EXCLUSIVE MODE"))
+
+    removed = conn.execute(text(
+        f"DELETE FROM {STAGING_TABLE} t WHERE {KEPT} AND NOT EXISTS ("
+        f"SELECT 1 FROM {LIVE_TABLE} l WHERE l.id = t.id AND ROW(l.*) IS NOT DISTINCT FROM ROW(t.*))"
+    ), params).rowcount
+    added = conn.execute(text(
+        f"INSERT INTO {STAGING_TABLE} SELECT * FROM {LIVE_TABLE} t WHERE {KEPT} "
+        f"AND NOT EXISTS (SELECT 1 FROM {STAGING_TABLE} s WHERE s.id = t.id)"
+    ), params).rowcount
+    print(f"[REBUILD] swap delta: -{removed} +{added}")
+
+    if failed:
+        carried = conn.execute(text(
+            f"INSERT INTO {STAGING_TABLE} SELECT t.* FROM {LIVE_TABLE} t "
+            f"JOIN unnest(CAST(:f_symbols AS text[]), CAST(:f_dates AS date[]), CAST(:f_types AS text[])) "
+            f"AS f(symbol, trade_date, index_type) USING (symbol, trade_date, index_type)"
+        ), {
+            "f_symbols": [r["symbol"] for r in failed],
+            "f_dates": [r["trade_date"] for r in failed],
+            "f_types": [r["index_type"] for r in failed],
+        }).rowcount
+        print(f"[REBUILD] kept {carried} previous rows for days that failed to recompute")
+
+    seq = conn.execute(text(f"SELECT pg_get_serial_sequence('{LIVE_TABLE}', 'id')")).scalar()
+    if seq is not None:
+        conn.execute(text(f"ALTER SEQUENCE {seq} OWNED BY {STAGING_TABLE}.id"))
+
+    conn.execute(text(f"DROP TABLE {LIVE_TABLE}"))
+    conn.execute(text(f"ALTER TABLE {STAGING_TABLE} RENAME TO {LIVE_TABLE}"))
+    conn.execute(text(f"ALTER TABLE {LIVE_TABLE} RENAME CONSTRAINT {STAGING_TABLE}_pkey TO {LIVE_TABLE}_pkey"))
+    conn.execute(text("ALTER INDEX ix_vix_symbol_date_staging RENAME TO ix_vix_symbol_date"))
+
+def rebuild_vix_table(
+    symbols: list[str],
+    index_types: list[str] = list(VIX_INDEX_CONFIG),
+    chunk_size: int = WRITE_CHUNK_ROWS,
+):
+    '''
+    Full recompute of the given symbols and index types into a staging table,
+    swapped in for vix_index_values at the end. The live table stays readable
+    until the swap, and days that fail to recompute keep their previous row.
+    '''
+    for index_type in index_types:
+        if index_type not in VIX_INDEX_CONFIG:
+            raise ValueError(f"Unknown index_type: {index_type}")
+
+    term_groups = tuple(
+        g for t in index_types for g in VIX_INDEX_CONFIG[t]["term_groups"]
+    )
+
+    written = {}
+    fail_rows = []
+
+    with engine.connect() as read_conn, engine.connect() as write_conn:
+        create_staging_table(write_conn)
+        write_conn.commit()
+
+        rates = RateStore.load(read_conn)
+
+        for symbol in symbols:
+            print(f"[REBUILD] {symbol} {list(index_types)}")
+            rows = []
+
+            for d, day in iter_day_chains(read_conn, symbol, term_groups):
+                for index_type in index_types:
+                    try:
+                        data = compute_day_vix(symbol, d, day, index_type, rates)
+                    except ValueError as e:
+                        print(f"[FAIL] {symbol} {d} {index_type}: {e}")
+                        fail_rows.append(dict(symbol=symbol, trade_date=d, index_type=index_type, reason=str(e)))
+                        continue
+
+                    if data is None:
+                        fail_rows.append(dict(
+                            symbol=symbol, trade_date=d, index_type=index_type, reason="missing option data"))
+                        continue
+
+                    rows.append(data)
+                    written.setdefault((symbol, index_type), []).append(d)
+
+                if len(rows) >= chunk_size:
+                    copy_rows(write_conn, rows)
+                    write_conn.commit()
+                    rows = []
+
+            copy_rows(write_conn, rows)
+            write_conn.commit()
+
+        n_kept = copy_kept_rows(write_conn, symbols, index_types)
+        write_conn.commit()
+        print(f"[REBUILD] carried over {n_kept} rows")
+
+        print("[REBUILD] building indexes")
+        build_staging_indexes(write_conn)
+        write_conn.commit()
+
+        # separate tables from vix_index_values, so none of this needs the lock
+        for (symbol, index_type), dates in written.items():
+            record_input_state(write_conn, symbol, index_type, dates)
+        record_vix_failures(write_conn, fail_rows)
+        write_conn.commit()
+
+        with write_conn.begin():
+            swap_staging_table(write_conn, symbols, index_types, fail_rows)
+
+    n = sum(len(v) for v in written.values())
+    print(f"[DONE] rebuild {symbols} | rows={n}, failed={len(fail_rows)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", "-s", nargs="+", required=True)
+    parser.add_argument("--index-types", "-i", nargs="+", default=list(VIX_INDEX_CONFIG))
+
+    args = parser.parse_args()
+
+    rebuild_vix_table(args.symbols, args.index_types)
@@ -0,0 +1,217 @@
+from datetime import date
+from sqlalchemy import select, update, func, literal, or_, exists
+from sqlalchemy.dialects.postgresql import insert, aggregate_order_by
+
+from ..models.rates import RiskFreeRate
+from ..models.vix_index_values import VIXIndexValues
+from ..models.vix_input_state import VIXInputState
+from ..models.vix_failures import VIXFailure
+from .rates_adapter import MAX_LOOKBACK_DAYS
+from .loader import quote_source
+
+STATE_KEYS = ("symbol", "trade_date", "index_type")
+
+def quotes_fingerprint(src=None):
+    # Changes whenever quotes for the day are added or re-ingested
+    src = quote_source() if src is None else src
+    return func.concat(func.count(src.c.id), ':', func.max(src.c.id))
+
+def rates_fingerprint(trade_date, outer):
+    # md5 of the rates an as-of lookup on trade_date can see; '' when none
+    rates = (
+        select(func.md5(func.string_agg(
+            func.concat(RiskFreeRate.trade_date, ' ', RiskFreeRate.tenor, '=', RiskFreeRate.rate_bey),
+            aggregate_order_by(literal(','), RiskFreeRate.trade_date, RiskFreeRate.tenor),
+        )))
+        .where(
+            RiskFreeRate.trade_date <= trade_date,
+            RiskFreeRate.trade_date > trade_date - MAX_LOOKBACK_DAYS,
+        )
+        .correlate(outer)
+        .scalar_subquery()
+    )
+
+    return func.coalesce(rates, '')
+
+def failed_on_current_inputs(symbol: str, index_type: str, trade_date, outer):
+    # EXISTS for a vix_failures row recorded against the day's current quotes
+    # and rates; the fingerprint aggregates only run for days that have one
+    src = quote_source()
+
+    quotes = (
+        select(quotes_fingerprint(src))
+        .where(
+            src.c.symbol == symbol,
+            src.c.trade_date == trade_date,
+        )
+        .correlate(outer)
+        .scalar_subquery()
+    )
+
+    return exists().where(
+        VIXFailure.symbol == symbol,
+        VIXFailure.index_type == index_type,
+        VIXFailure.trade_date == trade_date,
+        VIXFailure.fingerprint == quotes,
+        VIXFailure.rates_fingerprint == rates_fingerprint(trade_date, outer),
+    )
+
+def input_fingerprints(symbol=None, start_date=None, end_date=None, dates=None):
+    '''
+    One row per (symbol, trade_date) in the quote source with the quotes
+    fingerprint and a hash of every rate inside the as-of lookback window,
+    so a revised or newly arrived curve changes it.
+    '''
+    src = quote_source()
+
+    days = (
+        select(
+            src.c.symbol.label("symbol"),
+            src.c.trade_date.label("trade_date"),
+            quotes_fingerprint(src).label("quotes_fingerprint"),
+        )
+        .group_by(src.c.symbol, src.c.trade_date)
+    )
+    if symbol is not None:
+        days = days.where(src.c.symbol == symbol)
+    if start_date is not None:
+        days = days.where(src.c.trade_date >= start_date)
+    if end_date is not None:
+        days = days.where(src.c.trade_date <= end_date)
+    if dates is not None:
+        days = days.where(src.c.trade_date.in_(list(dates)))
+
+    days = days.subquery()
+
+    return select(
+        days.c.symbol,
+        days.c.trade_date,
+        days.c.quotes_fingerprint,
+        rates_fingerprint(days.c.trade_date, days).label("rates_fingerprint"),
+    )
+
+def record_input_state(conn, symbol: str, index_type: str, dates):
+    # Snapshot the inputs of freshly written VIX rows; clears is_stale
+    dates = list(dates)
+    if not dates:
+        return
+
+    fp = input_fingerprints(symbol, dates=dates).subquery()
+
+    stmt = insert(VIXInputState).from_select(
+        ["symbol", "trade_date", "index_type", "quotes_fingerprint", "rates_fingerprint", "is_stale"],
+        select(
+            fp.c.symbol,
+            fp.c.trade_date,
+            literal(index_type),
+            fp.c.quotes_fingerprint,
+            fp.c.rates_fingerprint,
+            literal(False),
+        ),
+    )
+
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(STATE_KEYS),
+        set_={
+            "quotes_fingerprint": stmt.excluded.quotes_fingerprint,
+            "rates_fingerprint": stmt.excluded.rates_fingerprint,
+            "is_stale": False,
+            "updated_at": func.now(),
+        }
+    )
+
+    conn.execute(stmt)
+
+def record_input_state_rows(conn, rows: list[dict]):
+    groups = {}
+    for r in rows:
+        groups.setdefault((r["symbol"], r["index_type"]), []).append(r["trade_date"])
+
+    for (symbol, index_type), dates in groups.items():
+        record_input_state(conn, symbol, index_type, dates)
+
+def mark_stale_vix(
+        conn,
+        symbol: str | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        trust_untracked: bool = False,
+):
+    '''
+    Flags VIX rows whose quotes or rates changed since they were computed.
+    VIX rows with no recorded inputs are adopted as current when
+    trust_untracked is set, otherwise they are marked stale as well.
+    '''
+    fp = input_fingerprints(symbol, start_date, end_date).subquery()
+
+    untracked = (
+        select(
+            VIXIndexValues.symbol,
+            VIXIndexValues.trade_date,
+            VIXIndexValues.index_type,
+            fp.c.quotes_fingerprint,
+            fp.c.rates_fingerprint,
+            literal(not trust_untracked),
+        )
+        .join(fp, (fp.c.symbol == VIXIndexValues.symbol) & (fp.c.trade_date == VIXIndexValues.trade_date))
+        .where(~exists().where(
+            VIXInputState.symbol == VIXIndexValues.symbol,
+            VIXInputState.trade_date == VIXIndexValues.trade_date,
+            VIXInputState.index_type == VIXIndexValues.index_type,
+        ))
+    )
+
+    adopted = conn.execute(
+        insert(VIXInputState)
+        .from_select(
+            ["symbol", "trade_date", "index_type", "quotes_fingerprint", "rates_fingerprint", "is_stale"],
+            untracked,
+        )
+        .on_conflict_do_nothing(index_elements=list(STATE_KEYS))
+    ).rowcount
+
+    changed = conn.execute(
+        update(VIXInputState)
+        .where(
+            VIXInputState.symbol == fp.c.symbol,
+            VIXInputState.trade_date == fp.c.trade_date,
+            ~VIXInputState.is_stale,
+            or_(
+                VIXInputState.quotes_fingerprint != fp.c.quotes_fingerprint,
+                VIXInputState.rates_fingerprint != fp.c.rates_fingerprint,
+            ),
+        )
+        .values(is_stale=True, updated_at=func.now())
+    ).rowcount
+
+    print(f"[STALE] {symbol or 'all symbols'} | changed={changed}, untracked={adopted}")
+
+    return changed
+
+def get_stale_vix_dates(
+        session,
+        symbol: str,
+        index_type: str,
+        start_date: date | None = None,
+        end_date: date | None = None,
+):
+    # a stale day that failed again is parked like any other failure
+    failed = failed_on_current_inputs(
+        symbol, index_type, VIXInputState.trade_date, VIXInputState.__table__)
+
+    stmt = (
+        select(VIXInputState.trade_date)
+        .where(
+            VIXInputState.symbol == symbol,
+            VIXInputState.index_type == index_type,
+            VIXInputState.is_stale,
+            ~failed,
+        )
+        .order_by(VIXInputState.trade_date)
+    )
+    if start_date is not None:
+        stmt = stmt.where(VIXInputState.trade_date >= start_date)
+    if end_date is not None:
+        stmt = stmt.where(VIXInputState.trade_date <= end_date)
+
+    return list(session.execute(stmt).scalars())
@@ -0,0 +1,196 @@
+import numpy as np
+
+from .calculator import calc_vix
+from .vector_calculator import calc_term_variance
+
+# Full recompute after this many incremental updates to bound float drift
+REFRESH_EVERY = 10_000
+
+class StreamingTermVariance:
+    '''
+    Holds one term's strike grid and running contribution sum.
+
+    update() applies a single quote change. Changes that cannot move the
+    forward strike, K0 or either zero-bid cutoff are applied in O(1);
+    anything else falls back to a full vectorized refresh.
+    '''
+
+    def __init__(self, call_df, put_df, r, T):
+        self.r = r
+        self.T = T
+        self.discount = np.exp(r * T)
+
+        self.strikes = np.union1d(
+            call_df["strike"].to_numpy(dtype=np.float64),
+            put_df["strike"].to_numpy(dtype=np.float64),
+        )
+        self.index = {k: i for i, k in enumerate(self.strikes.tolist())}
+
+        n = self.strikes.size
+        self.bid = {"C": np.full(n, np.nan), "P": np.full(n, np.nan)}
+        self.mid = {"C": np.full(n, np.nan), "P": np.full(n, np.nan)}
+
+        for cp, df in (("C", call_df), ("P", put_df)):
+            idx = np.searchsorted(self.strikes, df["strike"].to_numpy(dtype=np.float64))
+            self.bid[cp][idx] = df["bid"].to_numpy(dtype=np.float64)
+            self.mid[cp][idx] = df["mid"].to_numpy(dtype=np.float64)
+
+        self.full_refreshes = 0
+        self.fast_updates = 0
+        self.refresh()
+
+    def _side_arrays(self, cp):
+        present = ~np.isnan(self.mid[cp])
+        return self.strikes[present], self.bid[cp][present], self.mid[cp][present]
+
+    def _diff_at(self, i):
+        c = self.mid["C"][i]
+        p = self.mid["P"][i]
+        if np.isnan(c) or np.isnan(p) or c == 0 or p == 0:
+            return np.inf
+        d = abs(c - p)
+        # zero differences are never selected by calc_K0
+        return d if d != 0 else np.inf
+
+    def refresh(self):
+        call_strike, call_bid, call_mid = self._side_arrays("C")
+        put_strike, put_bid, put_mid = self._side_arrays("P")
+
+        term = calc_term_variance(
+            call_strike, call_bid, call_mid,
+            put_strike, put_bid, put_mid,
+            r=self.r, T=self.T,
+        )
+
+        self.forward = term["forward"]
+        self.K0 = term["K0"]
+        self.k0_index = self.index[self.K0]
+
+        c = self.mid["C"]
+        p = self.mid["P"]
+        with np.errstate(invalid="ignore"):
+            valid = (c != 0) & (p != 0) & ~np.isnan(c) & ~np.isnan(p)
+            diff = np.where(valid, np.abs(c - p), np.inf)
+        diff[diff == 0] = np.inf
+        self.diff = diff
+        self.best = int(np.argmin(diff))
+
+        pos = np.searchsorted(self.strikes, term["strikes"])
+        self.strip_pos = np.full(self.strikes.size, -1)
+        self.strip_pos[pos] = np.arange(pos.size)
+
+        self.delta_K = term["delta_K"]
+        self.contribution = term["delta_K"] / term["strikes"] ** 2 * self.discount * term["mids"]
+        self.total = float(self.contribution.sum())
+
+        self.updates_since_refresh = 0
+        self.full_refreshes += 1
+
+    def update(self, strike, cp, bid, ask):
+        if cp not in ("C", "P"):
+            raise ValueError(f"Unknown cp: {cp}")
+        if strike not in self.index:
+            raise ValueError(f"Strike {strike} is not on the grid")
+
+        i = self.index[strike]
+        mid = (bid + ask) / 2
+
+        old_bid = self.bid[cp][i]
+        old_mid = self.mid[cp][i]
+        self.bid[cp][i] = bid
+        self.mid[cp][i] = mid
+
+        if self._needs_refresh(i, cp, old_bid, old_mid):
+            self.refresh()
+            return False
+
+        k = self.strip_pos[i]
+        K = self.strikes[i]
+        uses_side = (cp == "P" and K < self.K0) or (cp == "C" and K > self.K0)
+
+        if k >= 0 and uses_side:
+            new = self.delta_K[k] / K ** 2 * self.discount * mid
+            self.total += new - self.contribution[k]
+            self.contribution[k] = new
+
+        self.updates_since_refresh += 1
+        self.fast_updates += 1
+        if self.updates_since_refresh >= REFRESH_EVERY:
+            self.refresh()
+
+        return True
+
+    def _needs_refresh(self, i, cp, old_bid, old_mid):
+        K = self.strikes[i]
+
+        # quote appearing or disappearing changes the side arrays
+        if np.isnan(old_mid) or np.isnan(self.mid[cp][i]):
+            return True
+
+        # the K0 row is the P/C average and anchors both strips
+        if i == self.k0_index:
+            return True
+
+        # forward strike: current argmin moved, or a new one undercuts it
+        d = self._diff_at(i)
+        self.diff[i] = d
+        if i == self.best:
+            return True
+        best_d = self.diff[self.best]
+        if d < best_d or (d == best_d and i < self.best):
+            return True
+
+        # a zero-bid flip on the strip side can move the cutoff
+        on_strip_side = (cp == "P" and K <= self.K0) or (cp == "C" and K >= self.K0)
+        if on_strip_side and (old_bid == 0) != (self.bid[cp][i] == 0):
+            return True
+
+        return False
+
+    @property
+    def variance(self):
+        return 2 / self.T * self.total - (self.forward / self.K0 - 1) ** 2 / self.T
+
+
+class StreamingVIX:
+    '''
+    Two-term VIX kept current under individual quote updates.
+    '''
+
+    def __init__(
+        self,
+        call_near, put_near,
+        call_next, put_next,
+        M_CM,
+        r1=0.0,
+        r2=0.0,
+    ):
+        self.M_T1 = call_near["dte"].iloc[0]
+        self.M_T2 = call_next["dte"].iloc[0]
+        self.T1 = self.M_T1 / 365
+        self.T2 = self.M_T2 / 365
+        self.M_CM = M_CM
+
+        self.terms = {
+            "near": StreamingTermVariance(call_near, put_near, r1, self.T1),
+            "next": StreamingTermVariance(call_next, put_next, r2, self.T2),
+        }
+
+    def update(self, term, strike, cp, bid, ask):
+        return self.terms[term].update(strike, cp, bid, ask)
+
+    @property
+    def vix(self):
+        return float(calc_vix(
+            self.terms["near"].variance, self.terms["next"].variance,
+            self.T1, self.T2, self.M_T1, self.M_T2, self.M_CM,
+        ))
+
+    def result(self):
+        return {
+            "vix": self.vix,
+            "variance_near": float(self.terms["near"].variance),
+            "variance_next": float(self.terms["next"].variance),
+            "t_near": float(self.T1),
+            "t_next": float(self.T2),
+        }
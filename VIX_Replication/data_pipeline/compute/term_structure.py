@@ -0,0 +1,92 @@
+from datetime import date
+from sqlalchemy.orm import Session
+
+from .calculator import calc_vix
+from .loader import load_day_chain
+from .rates_adapter import load_rate_curve, build_rate_interpolator
+from .vector_calculator import prepare_term_arrays, calc_term_variance
+
+DEFAULT_MATURITIES = (9, 30, 60, 90, 180)
+
+def calc_expiry_variances(chain, rates_series):
+    '''
+    Model-free variance for every expiry (dte > 0) in a day's chain.
+    Each expiry is computed once and can then serve any number of maturities.
+    '''
+    expiries = []
+
+    groups = list(chain[chain["dte"] > 0].groupby("dte", sort=True))
+    if not groups:
+        return expiries
+
+    rates = build_rate_interpolator(rates_series)([dte for dte, _ in groups])
+
+    for (dte, grp), r in zip(groups, rates):
+        calls = grp[grp.cp == "C"]
+        puts = grp[grp.cp == "P"]
+        if calls.empty or puts.empty:
+            continue
+
+        T = dte / 365
+        r = float(r)
+
+        try:
+            term = calc_term_variance(**prepare_term_arrays(calls, puts), r=r, T=T)
+        except ValueError as e:
+            print(f"[WARNING] skip expiry dte={dte}: {e}")
+            continue
+
+        expiries.append(dict(
+            dte=int(dte),
+            t=T,
+            r=r,
+            forward=term["forward"],
+            K0=term["K0"],
+            n_strikes=int(term["strikes"].size),
+            variance=term["variance"],
+        ))
+
+    return expiries
+
+def interpolate_constant_maturity(expiries, M_CM):
+    # Same bracketing as parse_and_insert.classify: near < M_CM < next
+    below = [e for e in expiries if e["dte"] < M_CM]
+    above = [e for e in expiries if e["dte"] > M_CM]
+    if not below or not above:
+        return None
+
+    near = max(below, key=lambda e: e["dte"])
+    nxt = min(above, key=lambda e: e["dte"])
+
+    vix = calc_vix(
+        near["variance"], nxt["variance"],
+        near["t"], nxt["t"],
+        near["dte"], nxt["dte"],
+        M_CM,
+    )
+
+    return {
+        "vix": float(vix),
+        "variance_near": near["variance"],
+        "variance_next": nxt["variance"],
+        "t_near": near["t"],
+        "t_next": nxt["t"],
+    }
+
+def compute_term_structure(
+        session: Session,
+        symbol: str,
+        trade_date: date,
+        maturities=DEFAULT_MATURITIES,
+):
+    chain = load_day_chain(session, symbol, trade_date)
+    if chain.empty:
+        return {}
+
+    rates_series = load_rate_curve(session, trade_date)
+    expiries = calc_expiry_variances(chain, rates_series)
+
+    return {
+        M_CM: interpolate_constant_maturity(expiries, M_CM)
+        for M_CM in maturities
+    }
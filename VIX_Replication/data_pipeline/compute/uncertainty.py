@@ -0,0 +1,200 @@
+import numpy as np
+from datetime import date
+from sqlalchemy.dialects.postgresql import insert
+
+from ..models.vix_uncertainty import VIXUncertainty
+
+from .calculator import calc_vix
+from .vector_calculator import strip_layout, strip_mids, calc_delta_K
+
+DEFAULT_DRAWS = 2000
+DRAW_BATCH = 500
+
+QUOTE_COLUMNS = ["trade_date", "term_group", "cp", "strike", "bid", "ask", "mid", "dte"]
+
+def _side(df):
+    df = df.sort_values("strike", kind="stable")
+    bid = df["bid"].to_numpy(dtype=np.float64)
+    ask = df["ask"].to_numpy(dtype=np.float64)
+    mid = df["mid"].to_numpy(dtype=np.float64)
+
+    # only two-sided quotes are perturbed; zero-bid, one-sided or crossed
+    # quotes stay at their mid (a zero-bid ITM ask can be thousands wide)
+    fixed = ~(bid > 0) | np.isnan(ask) | (ask < bid)
+    lo = np.where(fixed, mid, bid)
+    hi = np.where(fixed, mid, ask)
+
+    return df["strike"].to_numpy(dtype=np.float64), bid, lo, hi
+
+def simulate_term_variance(call_df, put_df, r, T, n_draws, rng):
+    '''
+    Variance of one term for n_draws quote sets, each two-sided mid drawn
+    uniformly inside its bid/ask. The forward and K0 are re-selected per draw; draws
+    that land on the same K0 share one strip layout and are evaluated as
+    a single matrix product.
+    '''
+    call_strike, call_bid, c_lo, c_hi = _side(call_df)
+    put_strike, put_bid, p_lo, p_hi = _side(put_df)
+
+    C = c_lo + rng.random((n_draws, call_strike.size)) * (c_hi - c_lo)
+    P = p_lo + rng.random((n_draws, put_strike.size)) * (p_hi - p_lo)
+
+    common, ci, pi = np.intersect1d(call_strike, put_strike, return_indices=True)
+    c = C[:, ci]
+    p = P[:, pi]
+
+    diff = np.where((c != 0) & (p != 0), np.abs(c - p), np.inf)
+    diff[diff == 0] = np.inf
+    j = np.argmin(diff, axis=1)
+    rows = np.arange(n_draws)
+
+    growth = np.exp(r * T)
+    forward = common[j] + growth * (c[rows, j] - p[rows, j])
+
+    k0_pos = np.searchsorted(call_strike, forward, side="right") - 1
+    variance = np.full(n_draws, np.nan)
+
+    for pos in np.unique(k0_pos):
+        if pos < 0:
+            continue
+        K0 = call_strike[pos]
+        sel = k0_pos == pos
+
+        try:
+            layout = strip_layout(call_strike, call_bid, put_strike, put_bid, K0)
+        except ValueError:
+            continue
+
+        weights = calc_delta_K(layout["strikes"]) / layout["strikes"] ** 2 * growth
+        mids = strip_mids(layout, C[sel], P[sel])
+
+        variance[sel] = 2 / T * (mids @ weights) - (forward[sel] / K0 - 1) ** 2 / T
+
+    return variance
+
+def simulate_vix(
+    call_near, put_near,
+    call_next, put_next,
+    M_CM,
+    r1=0.0,
+    r2=0.0,
+    n_draws=DEFAULT_DRAWS,
+    seed=None,
+):
+    rng = np.random.default_rng(seed)
+
+    M_T1 = call_near["dte"].iloc[0]
+    M_T2 = call_next["dte"].iloc[0]
+    T1 = M_T1 / 365
+    T2 = M_T2 / 365
+
+    out = []
+    for start in range(0, n_draws, DRAW_BATCH):
+        n = min(DRAW_BATCH, n_draws - start)
+        sigma1 = simulate_term_variance(call_near, put_near, r1, T1, n, rng)
+        sigma2 = simulate_term_variance(call_next, put_next, r2, T2, n, rng)
+
+        with np.errstate(invalid="ignore"):
+            out.append(calc_vix(sigma1, sigma2, T1, T2, M_T1, M_T2, M_CM))
+
+    return np.concatenate(out)
+
+def summarize_draws(vix):
+    vix = vix[np.isfinite(vix)]
+    if vix.size == 0:
+        return None
+
+    p05, p50, p95 = np.percentile(vix, [5, 50, 95])
+
+    return dict(
+        n_draws=int(vix.size),
+        vix_mean=float(vix.mean()),
+        vix_std=float(vix.std(ddof=1)) if vix.size > 1 else 0.0,
+        vix_p05=float(p05),
+        vix_p50=float(p50),
+        vix_p95=float(p95),
+    )
+
+def upsert_uncertainty(conn, rows: list[dict]):
+    if not rows:
+        return
+
+    stmt = insert(VIXUncertainty).values(rows)
+
+    keys = ("symbol", "trade_date", "index_type")
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(keys),
+        set_={k: stmt.excluded[k] for k in rows[0] if k not in keys},
+    )
+
+    conn.execute(stmt)
+
+def run_vix_uncertainty_history(
+    symbol: str,
+    index_type: str,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    n_draws: int = DEFAULT_DRAWS,
+    seed: int = 0,
+    chunk_size: int | None = None,
+):
+    # database imports stay out of module scope so the simulation can be
+    # used (and tested) without a configured DB_URL
+    from ..db.engine import engine
+    from .batch import WRITE_CHUNK_ROWS, iter_day_chains
+    from .rate_store import RateStore
+    from .updater import VIX_INDEX_CONFIG
+
+    chunk_size = chunk_size or WRITE_CHUNK_ROWS
+
+    if index_type not in VIX_INDEX_CONFIG:
+        raise ValueError(f"Unknown index_type: {index_type}")
+
+    cfg = VIX_INDEX_CONFIG[index_type]
+    near_group, next_group = cfg["term_groups"]
+
+    print(f"[RUN] uncertainty {symbol} {index_type} ({n_draws} draws)")
+
+    rows = []
+
+    with engine.connect() as read_conn, engine.connect() as write_conn:
+        rates = RateStore.load(read_conn, start_date, end_date)
+
+        for d, day in iter_day_chains(
+                read_conn, symbol, cfg["term_groups"], start_date, end_date, columns=QUOTE_COLUMNS):
+            near = day[day.term_group == near_group]
+            nxt = day[day.term_group == next_group]
+            call_near, put_near = near[near.cp == "C"], near[near.cp == "P"]
+            call_next, put_next = nxt[nxt.cp == "C"], nxt[nxt.cp == "P"]
+
+            if call_near.empty or call_next.empty:
+                continue
+
+            try:
+                r1, r2 = rates.rates_for(d, [call_near["dte"].iloc[0], call_next["dte"].iloc[0]])
+
+                # per-day seed keeps reruns of a single date reproducible
+                vix = simulate_vix(
+                    call_near, put_near, call_next, put_next,
+                    cfg["M_CM"], float(r1), float(r2), n_draws, seed=(seed, d.toordinal()),
+                )
+            except Exception as e:
+                print(f"[FAIL] {symbol} {d}: {e}")
+                continue
+
+            summary = summarize_draws(vix)
+            if summary is None:
+                print(f"[FAIL] {symbol} {d}: no finite draws")
+                continue
+
+            rows.append(dict(symbol=symbol, trade_date=d, index_type=index_type, **summary))
+
+            if len(rows) >= chunk_size:
+                upsert_uncertainty(write_conn, rows)
+                write_conn.commit()
+                rows = []
+
+        upsert_uncertainty(write_conn, rows)
+        write_conn.commit()
+
+    print(f"[DONE] uncertainty {symbol} {index_type}")
@@ -1,15 +1,27 @@
+import logging
 from datetime import date
-from sqlalchemy import text, func
+from sqlalchemy import text, func, select, exists
 from sqlalchemy.orm import Session
 from sqlalchemy.dialects.postgresql import insert
 
 from ..db.engine import SessionLocal, engine
-from ..models.option_quotes import OptionQuote
 from ..models.vix_index_values import VIXIndexValues
+from ..models.vix_diagnostics import VIXDiagnostics
+from ..models.vix_failures import VIXFailure
+from ..utils import metrics
 
-from .loader import load_option_data
-from .calculator import compute_vix_from_dataframes
+from .loader import load_option_data, quote_source
+from .vector_calculator import compute_vix_vectorized
 from .rates_adapter import compute_r1_r2
+from .diagnostics import make_timer, diagnostics_row
+from .chain_cache import ChainCache
+from .rate_store import RateStore
+from .staleness import (
+    failed_on_current_inputs,
+    input_fingerprints,
+    record_input_state_rows,
+    get_stale_vix_dates,
+)
 
 VIX_INDEX_CONFIG = {
     "VIX": {
@@ -22,6 +34,11 @@ VIX_INDEX_CONFIG = {
     },
 }
 
+HISTORY_CHUNK_ROWS = 500
+
+# per-day outcomes are counted in vix_days_total; the messages are debug only
+log = logging.getLogger(__name__)
+
 def clear_vix_table(symbol: str | None = None, index_type: str | None = None):
     if symbol is None and index_type is None:
         sql = "TRUNCATE TABLE vix_index_values"
@@ -65,91 +82,271 @@ def upsert_vix(session, data: dict):
 
     session.execute(stmt)
 
+def upsert_vix_many(conn, rows: list[dict]):
+    if not rows:
+        return
+
+    stmt = insert(VIXIndexValues).values(rows)
+
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["symbol", "trade_date", "index_type"],
+        set_={
+            "vix_value": stmt.excluded.vix_value,
+            "variance_near": stmt.excluded.variance_near,
+            "variance_next": stmt.excluded.variance_next,
+            "t_near": stmt.excluded.t_near,
+            "t_next": stmt.excluded.t_next,
+        }
+    )
+
+    conn.execute(stmt)
+
+def upsert_diagnostics(session, data: dict):
+    stmt = insert(VIXDiagnostics).values(**data)
+
+    keys = ("symbol", "trade_date", "index_type")
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(keys),
+        set_={k: stmt.excluded[k] for k in data if k not in keys},
+    )
+
+    session.execute(stmt)
+
+def upsert_diagnostics_many(conn, rows: list[dict]):
+    if not rows:
+        return
+
+    stmt = insert(VIXDiagnostics).values(rows)
+
+    keys = ("symbol", "trade_date", "index_type")
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(keys),
+        set_={k: stmt.excluded[k] for k in rows[0] if k not in keys},
+    )
+
+    conn.execute(stmt)
+
+def record_vix_failures(conn, rows: list[dict]):
+    '''
+    rows: dicts with symbol, trade_date, index_type, reason. The quotes and
+    rates fingerprints are attached here so the day is retried once either
+    input changes.
+    '''
+    if not rows:
+        return
+
+    fingerprints = {}
+    for symbol in {r["symbol"] for r in rows}:
+        dates = {r["trade_date"] for r in rows if r["symbol"] == symbol}
+        for fp in conn.execute(input_fingerprints(symbol, dates=dates)):
+            fingerprints[(symbol, fp.trade_date)] = (fp.quotes_fingerprint, fp.rates_fingerprint)
+
+    values = []
+    for r in rows:
+        quotes_fp, rates_fp = fingerprints.get((r["symbol"], r["trade_date"]), ("0:", ""))
+        values.append(dict(r, reason=r["reason"][:500], fingerprint=quotes_fp, rates_fingerprint=rates_fp))
+
+    stmt = insert(VIXFailure).values(values)
+
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["symbol", "trade_date", "index_type"],
+        set_={
+            "reason": stmt.excluded.reason,
+            "fingerprint": stmt.excluded.fingerprint,
+            "rates_fingerprint": stmt.excluded.rates_fingerprint,
+            "created_at": func.now(),
+        }
+    )
+
+    conn.execute(stmt)
+
+def flush_vix_rows(session, out: dict):
+    with metrics.span("vix_upsert"):
+        upsert_vix_many(session, out["rows"])
+        record_input_state_rows(session, out["rows"])
+        upsert_diagnostics_many(session, out["diag_rows"])
+        record_vix_failures(session, out["fail_rows"])
+        session.commit()
+
+    metrics.inc("vix_rows_written_total", len(out["rows"]))
+
+    for buf in out.values():
+        buf.clear()
+
+def compute_single_day_vix(
+        session: Session,
+        symbol: str,
+        trade_date: date,
+        index_type: str,
+        diagnostics: dict | None = None,
+        cache=None,
+        rate_store=None,
+):
+    if index_type not in VIX_INDEX_CONFIG:
+        raise ValueError(f"Unknown index_type: {index_type}")
+
+    cfg = VIX_INDEX_CONFIG[index_type]
+    timer = make_timer(diagnostics)
+
+    with timer.stage("total"):
+        with timer.stage("load"), metrics.span("vix_load"):
+            call_near, put_near, call_next, put_next = load_option_data(
+                session=session, 
+                symbol=symbol, 
+                trade_date=trade_date,
+                term_groups=cfg['term_groups'],
+                cache=cache,
+            )
+
+        if call_near.empty or call_next.empty:
+            return None
+        
+        dte1 = call_near['dte'].iloc[0]
+        dte2 = call_next['dte'].iloc[0]
+
+        with timer.stage("rates"), metrics.span("vix_rates"):
+            r1, r2 = compute_r1_r2(
+                session=session,
+                trade_date=trade_date,
+                dte1=dte1,
+                dte2=dte2,
+                cache=cache,
+                rate_store=rate_store,
+            )
+
+        with metrics.span("vix_compute", index_type=index_type):
+            result = compute_vix_vectorized(
+                call_near=call_near,
+                put_near=put_near,
+                call_next=call_next,
+                put_next=put_next,
+                trade_date=trade_date,
+                r1=r1,
+                r2=r2,
+                M_CM=cfg['M_CM'],
+                diagnostics=diagnostics,
+            )
+
+    if diagnostics is not None:
+        diagnostics["stages"].update(timer.stages)
+
+    return dict(
+        symbol=symbol,
+        trade_date=trade_date,
+        index_type=index_type,
+        vix_value=result["vix"],
+        variance_near=result["variance_near"],
+        variance_next=result["variance_next"],
+        t_near=result["t_near"],
+        t_next=result["t_next"],
+    )
+
 def run_single_day_vix(
         symbol: str, 
         trade_date: date, 
         index_type: str,
+        diagnostics: bool = False,
+        cache=None,
+        rate_store=None,
 ):
     if index_type not in VIX_INDEX_CONFIG:
         raise ValueError(f"Unknown index_type: {index_type}")
-    
-    cfg = VIX_INDEX_CONFIG[index_type]
 
     session: Session = SessionLocal()
+    diag = {} if diagnostics else None
 
     try:
-        call_near, put_near, call_next, put_next = load_option_data(
-            session=session, 
-            symbol=symbol, 
-            trade_date=trade_date,
-            term_groups=cfg['term_groups']
-        )
+        data = compute_single_day_vix(session, symbol, trade_date, index_type, diag, cache, rate_store)
 
-        if call_near.empty or call_next.empty:
+        if data is None:
             print(f"[SKIP] {symbol} {trade_date} (missing option data)")
             return
-        
-        dte1 = call_near['dte'].iloc[0]
-        dte2 = call_next['dte'].iloc[0]
-
-        r1, r2 = compute_r1_r2(
-            session=session,
-            trade_date=trade_date,
-            dte1=dte1,
-            dte2=dte2,
-        )
-
-        result = compute_vix_from_dataframes(
-            call_near=call_near,
-            put_near=put_near,
-            call_next=call_next,
-            put_next=put_next,
-            trade_date=trade_date,
-            r1=r1,
-            r2=r2,
-            M_CM=cfg['M_CM'],
-        )
-
-        data = dict(
-            symbol=symbol,
-            trade_date=trade_date,
-            index_type=index_type,
-            vix_value=result["vix"],
-            variance_near=result["variance_near"],
-            variance_next=result["variance_next"],
-            t_near=result["t_near"],
-            t_next=result["t_next"],
-        )
 
         upsert_vix(session, data)
+        record_input_state_rows(session, [data])
+        if diag is not None:
+            upsert_diagnostics(session, diagnostics_row(symbol, trade_date, index_type, diag))
         session.commit()
 
-        print(f"[OK] {symbol} {trade_date}  VIX={result['vix']:.3f}")
+        print(f"[OK] {symbol} {trade_date}  VIX={data['vix_value']:.3f}")
 
     finally:
         session.close()
 
-def get_missing_vix_dates(session, symbol, index_type):
-    subq = (
-        session.query(VIXIndexValues.trade_date)
-        .filter(
-            VIXIndexValues.symbol == symbol,
-            VIXIndexValues.index_type == index_type,
-        )
-        .subquery()
+def get_missing_vix_dates(
+        session,
+        symbol: str,
+        index_type: str,
+        start_date: date | None = None,
+        end_date: date | None = None,
+):
+    '''
+    Dates in the quote source the loader reads with no VIX row, excluding
+    days already recorded as failed for the same input fingerprints.
+    '''
+    src = quote_source()
+
+    days = (
+        select(src.c.trade_date.label("trade_date"))
+        .where(src.c.symbol == symbol)
+        .distinct()
     )
+    if start_date is not None:
+        days = days.where(src.c.trade_date >= start_date)
+    if end_date is not None:
+        days = days.where(src.c.trade_date <= end_date)
 
-    rows = (
-        session.query(func.distinct(OptionQuote.trade_date))
-        .filter(
-            OptionQuote.symbol == symbol,
-            ~OptionQuote.trade_date.in_(subq)
-        )
-        .order_by(OptionQuote.trade_date)
-        .all()
+    days = days.subquery()
+
+    done = exists().where(
+        VIXIndexValues.symbol == symbol,
+        VIXIndexValues.index_type == index_type,
+        VIXIndexValues.trade_date == days.c.trade_date,
+    )
+    failed = failed_on_current_inputs(symbol, index_type, days.c.trade_date, days)
+
+    stmt = (
+        select(days.c.trade_date)
+        .where(~done, ~failed)
+        .order_by(days.c.trade_date)
     )
 
-    return [r[0] for r in rows]
+    return list(session.execute(stmt).scalars())
+
+def _new_buffers():
+    return {"rows": [], "diag_rows": [], "fail_rows": []}
+
+def _history_step(session, symbol, d, index_type, diagnostics, cache, rate_store, out):
+    diag = {} if diagnostics else None
+
+    try:
+        data = compute_single_day_vix(session, symbol, d, index_type, diag, cache, rate_store)
+    except ValueError as e:
+        # the calculator rejected these inputs; parked until they change
+        session.rollback()
+        metrics.inc("vix_days_total", status="fail", index_type=index_type)
+        log.debug(f"[FAIL] {symbol} {d} {index_type}: {e}")
+        out["fail_rows"].append(dict(symbol=symbol, trade_date=d, index_type=index_type, reason=str(e)))
+        return
+    except Exception as e:
+        # connection drops, lock timeouts, ... : not recorded, retried next run
+        session.rollback()
+        metrics.inc("vix_days_total", status="error", index_type=index_type)
+        log.warning(f"[ERROR] {symbol} {d} {index_type}: {e}")
+        return
+
+    if data is None:
+        metrics.inc("vix_days_total", status="skip", index_type=index_type)
+        log.debug(f"[SKIP] {symbol} {d} (missing option data)")
+        out["fail_rows"].append(dict(symbol=symbol, trade_date=d, index_type=index_type, reason="missing option data"))
+        return
+
+    out["rows"].append(data)
+    if diag is not None:
+        out["diag_rows"].append(diagnostics_row(symbol, d, index_type, diag))
+
+    metrics.inc("vix_days_total", status="ok", index_type=index_type)
+    log.debug(f"[OK] {symbol} {d}  VIX={data['vix_value']:.3f}")
 
 def run_vix_history(
     symbol: str,
@@ -157,6 +354,10 @@ def run_vix_history(
     start_date: date | None = None,
     end_date: date | None = None,
     clear_existing: bool = False,
+    diagnostics: bool = False,
+    cache=None,
+    chunk_size: int = HISTORY_CHUNK_ROWS,
+    stale_only: bool = False,
 ):
     if index_type not in VIX_INDEX_CONFIG:
         raise ValueError(f"Unknown index_type: {index_type}")
@@ -165,9 +366,18 @@ def run_vix_history(
         clear_vix_table(symbol=symbol, index_type=index_type)
 
     session: Session = SessionLocal()
+    out = _new_buffers()
 
     try:
-        dates = get_missing_vix_dates(session, symbol, index_type)
+        if stale_only:
+            dates = get_stale_vix_dates(session, symbol, index_type, start_date, end_date)
+        else:
+            dates = get_missing_vix_dates(session, symbol, index_type, start_date, end_date)
+        rate_store = RateStore.load(session, start_date, end_date)
+
+        if not dates:
+            print(f"[RUN] {symbol} {index_type} nothing to compute")
+            return
 
         print(
             f"[RUN] {symbol} {index_type} "
@@ -175,19 +385,61 @@ def run_vix_history(
         )
 
         for d in dates:
-            if start_date and d < start_date:
-                continue
-            if end_date and d > end_date:
-                continue
-
-            try:
-                run_single_day_vix(
-                    symbol=symbol,
-                    trade_date=d,
-                    index_type=index_type,
-                )
-            except Exception as e:
-                print(f"[FAIL] {symbol} {d}: {e}")
+            _history_step(session, symbol, d, index_type, diagnostics, cache, rate_store, out)
+
+            if len(out["rows"]) + len(out["fail_rows"]) >= chunk_size:
+                flush_vix_rows(session, out)
+
+        flush_vix_rows(session, out)
 
     finally:
-        session.close()
\ No newline at end of file
+        session.close()
+
+def run_vix_history_multi(
+    symbol: str,
+    index_types: tuple[str, ...] = tuple(VIX_INDEX_CONFIG),
+    start_date: date | None = None,
+    end_date: date | None = None,
+    diagnostics: bool = False,
+    cache=None,
+    chunk_size: int = HISTORY_CHUNK_ROWS,
+    stale_only: bool = False,
+):
+    '''
+    Date-major recompute for several index types: each day's chain and rate
+    curve are read once through the cache and shared by every index type.
+    '''
+    for index_type in index_types:
+        if index_type not in VIX_INDEX_CONFIG:
+            raise ValueError(f"Unknown index_type: {index_type}")
+
+    select_dates = get_stale_vix_dates if stale_only else get_missing_vix_dates
+
+    with SessionLocal() as session:
+        missing = {
+            index_type: set(select_dates(session, symbol, index_type, start_date, end_date))
+            for index_type in index_types
+        }
+
+        if cache is None:
+            cache = ChainCache(rate_store=RateStore.load(session, start_date, end_date))
+
+        dates = sorted(set().union(*missing.values()))
+
+        print(f"[RUN] {symbol} {list(index_types)} {len(dates)} dates")
+
+        out = _new_buffers()
+
+        for d in dates:
+            for index_type in index_types:
+                if d not in missing[index_type]:
+                    continue
+
+                _history_step(session, symbol, d, index_type, diagnostics, cache, None, out)
+
+            if len(out["rows"]) + len(out["fail_rows"]) >= chunk_size:
+                flush_vix_rows(session, out)
+
+        flush_vix_rows(session, out)
+
+    print(f"[DONE] {symbol} cache hits={cache.hits}, spill={cache.spill_hits}, misses={cache.misses}")
@@ -0,0 +1,201 @@
+import numpy as np
+
+from .calculator import calc_vix
+from .diagnostics import NULL_TIMER, make_timer
+
+def prepare_term_arrays(call_df, put_df):
+    call_df = call_df.sort_values("strike", kind="stable")
+    put_df = put_df.sort_values("strike", kind="stable")
+
+    return dict(
+        call_strike=call_df["strike"].to_numpy(dtype=np.float64),
+        call_bid=call_df["bid"].to_numpy(dtype=np.float64),
+        call_mid=call_df["mid"].to_numpy(dtype=np.float64),
+        put_strike=put_df["strike"].to_numpy(dtype=np.float64),
+        put_bid=put_df["bid"].to_numpy(dtype=np.float64),
+        put_mid=put_df["mid"].to_numpy(dtype=np.float64),
+    )
+
+def select_forward(call_strike, call_mid, put_strike, put_mid, r, T):
+    # Same rule as calc_K0: smallest non-zero |C - P| among strikes quoted on both sides
+    common, ci, pi = np.intersect1d(call_strike, put_strike, assume_unique=False, return_indices=True)
+    c = call_mid[ci]
+    p = put_mid[pi]
+
+    diff = np.where((c != 0) & (p != 0), np.abs(c - p), np.inf)
+    candidates = np.flatnonzero(diff != 0)
+    if candidates.size == 0:
+        raise ValueError("No strike with both call and put quotes")
+
+    j = candidates[np.argmin(diff[candidates])]
+    forward = common[j] + np.exp(r * T) * (c[j] - p[j])
+
+    below = call_strike[call_strike <= forward]
+    if below.size == 0:
+        raise ValueError("No strike below the forward level")
+
+    return forward, below.max()
+
+def put_cutoff(bid):
+    # Index of the first put kept after the last two consecutive zero bids
+    # (scanning down from K0), mirroring construct_dataframe
+    n = len(bid)
+    if n < 3:
+        return 0
+    zero = bid == 0
+    pairs = np.flatnonzero(zero[1:n - 1] & zero[:n - 2])
+    return int(pairs[-1]) + 2 if pairs.size else 0
+
+def call_cutoff(bid):
+    # Number of calls kept before the first two consecutive zero bids
+    # (scanning up from K0), mirroring construct_dataframe
+    n = len(bid)
+    if n < 3:
+        return n
+    zero = bid == 0
+    pairs = np.flatnonzero(zero[1:n - 1] & zero[2:n])
+    return int(pairs[0]) + 1 if pairs.size else n
+
+def calc_delta_K(strikes):
+    delta_K = np.empty_like(strikes)
+    delta_K[0] = abs(strikes[1] - strikes[0])
+    delta_K[-1] = abs(strikes[-1] - strikes[-2])
+    delta_K[1:-1] = np.abs(strikes[2:] - strikes[:-2]) / 2
+    return delta_K
+
+def calc_term_variance(call_strike, call_bid, call_mid, put_strike, put_bid, put_mid, r, T, timer=NULL_TIMER):
+    with timer.stage("calc_K0"):
+        forward, K0 = select_forward(call_strike, call_mid, put_strike, put_mid, r, T)
+
+    with timer.stage("construct_dataframe"):
+        strikes, mids, p_cut, c_cut = _select_strip(
+            call_strike, call_bid, call_mid, put_strike, put_bid, put_mid, K0
+        )
+
+    with timer.stage("calc_contribution"):
+        delta_K = calc_delta_K(strikes)
+        contribution = delta_K / strikes ** 2 * np.exp(r * T) * mids
+        variance = 2 / T * contribution.sum() - (forward / K0 - 1) ** 2 / T
+
+    return dict(
+        forward=float(forward),
+        K0=float(K0),
+        put_cutoff=p_cut,
+        call_cutoff=c_cut,
+        strikes=strikes,
+        mids=mids,
+        delta_K=delta_K,
+        variance=float(variance),
+    )
+
+def strip_layout(call_strike, call_bid, put_strike, put_bid, K0):
+    '''
+    Positions (into the sorted call/put arrays) of the OTM strip around K0
+    after the zero-bid cutoffs. Depends only on strikes and bids, so it can
+    be reused for any set of mids with the same K0.
+    '''
+    c_lo = int(np.searchsorted(call_strike, K0, side="left"))
+    p_hi = int(np.searchsorted(put_strike, K0, side="right"))
+
+    p_cut = put_cutoff(put_bid[:p_hi])
+    c_cut = call_cutoff(call_bid[c_lo:])
+
+    put_idx = np.arange(p_cut, p_hi)
+    call_idx = np.arange(c_lo, c_lo + c_cut)
+
+    k0_call = c_lo if c_cut > 0 and call_strike[c_lo] == K0 else -1
+    if p_hi > p_cut and put_strike[p_hi - 1] == K0:
+        # first match, as in construct_dataframe's .values[0]
+        k0_put = p_cut + int(np.searchsorted(put_strike[p_cut:p_hi], K0, side="left"))
+    else:
+        k0_put = -1
+
+    if k0_call < 0 and k0_put < 0:
+        raise ValueError("No valid option at K0")
+
+    put_idx = put_idx[put_strike[put_idx] != K0]
+    call_idx = call_idx[call_strike[call_idx] != K0]
+    strikes = np.concatenate((put_strike[put_idx], [K0], call_strike[call_idx]))
+
+    if strikes.size < 2:
+        raise ValueError("Not enough strikes after zero-bid cutoff")
+
+    return dict(
+        strikes=strikes,
+        put_idx=put_idx,
+        call_idx=call_idx,
+        k0_call=k0_call,
+        k0_put=k0_put,
+        put_cutoff=p_cut,
+        call_cutoff=c_cut,
+    )
+
+def strip_mids(layout, call_mid, put_mid):
+    # works on 1-d mids or on (n_draws, n_strikes) matrices
+    k0_call, k0_put = layout["k0_call"], layout["k0_put"]
+    if k0_call >= 0 and k0_put >= 0:
+        mid_K0 = (call_mid[..., k0_call] + put_mid[..., k0_put]) / 2
+    elif k0_call >= 0:
+        mid_K0 = call_mid[..., k0_call]
+    else:
+        mid_K0 = put_mid[..., k0_put]
+
+    return np.concatenate(
+        (put_mid[..., layout["put_idx"]], np.asarray(mid_K0)[..., None], call_mid[..., layout["call_idx"]]),
+        axis=-1,
+    )
+
+def _select_strip(call_strike, call_bid, call_mid, put_strike, put_bid, put_mid, K0):
+    layout = strip_layout(call_strike, call_bid, put_strike, put_bid, K0)
+    mids = strip_mids(layout, call_mid, put_mid)
+    return layout["strikes"], mids, layout["put_cutoff"], layout["call_cutoff"]
+
+def compute_vix_vectorized(
+    call_near, put_near,
+    call_next, put_next,
+    trade_date,
+    M_CM,
+    r1=0.0,
+    r2=0.0,
+    diagnostics=None,
+):
+    timer = make_timer(diagnostics)
+
+    M_T1 = call_near["dte"].iloc[0]
+    M_T2 = call_next["dte"].iloc[0]
+    T1 = M_T1 / 365
+    T2 = M_T2 / 365
+
+    with timer.stage("prepare"):
+        near_arrays = prepare_term_arrays(call_near, put_near)
+        next_arrays = prepare_term_arrays(call_next, put_next)
+
+    near = calc_term_variance(**near_arrays, r=r1, T=T1, timer=timer)
+    nxt = calc_term_variance(**next_arrays, r=r2, T=T2, timer=timer)
+
+    sigma1 = near["variance"]
+    sigma2 = nxt["variance"]
+    vix = calc_vix(sigma1, sigma2, T1, T2, M_T1, M_T2, M_CM)
+
+    if diagnostics is not None:
+        diagnostics.setdefault("stages", {}).update(timer.stages)
+        diagnostics.update(
+            forward_near=near["forward"],
+            forward_next=nxt["forward"],
+            K0_near=near["K0"],
+            K0_next=nxt["K0"],
+            n_strikes_near=int(near["strikes"].size),
+            n_strikes_next=int(nxt["strikes"].size),
+            put_cutoff_near=near["put_cutoff"],
+            call_cutoff_near=near["call_cutoff"],
+            put_cutoff_next=nxt["put_cutoff"],
+            call_cutoff_next=nxt["call_cutoff"],
+        )
+
+    return {
+        "vix": float(vix),
+        "variance_near": float(sigma1),
+        "variance_next": float(sigma2),
+        "t_near": float(T1),
+        "t_next": float(T2),
+    }
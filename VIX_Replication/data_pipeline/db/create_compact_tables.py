@@ -0,0 +1,142 @@
+import argparse
+from sqlalchemy import text
+
+from .engine import engine
+from ..models.symbols import Symbol
+from ..models.option_quotes_compact import (
+    OptionRoot,
+    OptionQuoteCompact,
+    CP_CODES,
+    TERM_GROUP_CODES,
+    COMPACT_VIEW,
+)
+
+MIGRATE_BATCH_ROWS = 1_000_000
+
+# last option_quotes id copied into the compact table
+SYNC_STATE_TABLE = "option_quotes_compact_sync"
+
+def _encode(column, codes):
+    whens = " ".join(f"WHEN '{k}' THEN {v}" for k, v in codes.items())
+    return f"CASE {column} {whens} END"
+
+def _decode(column, codes):
+    whens = " ".join(f"WHEN {v} THEN '{k}'" for k, v in codes.items())
+    return f"CASE {column} {whens} END"
+
+def create_compact_view(conn):
+    conn.execute(text(f"""
+        CREATE OR REPLACE VIEW {COMPACT_VIEW} AS
+        SELECT
+            q.id,
+            s.symbol,
+            q.trade_date,
+            q.option_symbol,
+            r.root AS option_root,
+            {_decode("q.cp", CP_CODES)} AS cp,
+            q.expiry,
+            q.dte::integer AS dte,
+            {_decode("q.term_group", TERM_GROUP_CODES)} AS term_group,
+            q.strike,
+            q.bid,
+            q.ask,
+            q.mid,
+            q.iv::float8 AS iv,
+            q.delta::float8 AS delta,
+            q.gamma::float8 AS gamma,
+            q.vega::float8 AS vega,
+            q.theta::float8 AS theta,
+            q.volume,
+            q.open_interest
+        FROM option_quotes_compact q
+        JOIN symbols s ON s.id = q.symbol_id
+        JOIN option_roots r ON r.id = q.root_id
+    """))
+
+def migrate_to_compact(batch_rows: int = MIGRATE_BATCH_ROWS):
+    '''
+    Copies option_quotes rows added since the last sync into the compact
+    table, one id range per transaction. The high-water mark (last option_quotes
+    id copied) advances with each range, so an interrupted sync resumes and
+    backfilled dates or new symbols are picked up by their new ids. Rows
+    already present are skipped and updates to them are not carried over.
+    Nothing else writes the compact table, so the view only reflects
+    option_quotes as of the last run.
+    '''
+    with engine.begin() as conn:
+        conn.execute(text(f"CREATE TABLE IF NOT EXISTS {SYNC_STATE_TABLE} (last_id bigint NOT NULL)"))
+        last_id = conn.execute(text(f"SELECT max(last_id) FROM {SYNC_STATE_TABLE}")).scalar() or 0
+
+        # only the new rows can bring new roots or symbols; a symbol missing
+        # here would be dropped by the join below
+        conn.execute(text("""
+            INSERT INTO option_roots (root)
+            SELECT DISTINCT option_root FROM option_quotes WHERE id > :last_id
+            ON CONFLICT (root) DO NOTHING
+        """), {"last_id": last_id})
+        conn.execute(text("""
+            INSERT INTO symbols (symbol, is_active)
+            SELECT DISTINCT symbol, true FROM option_quotes WHERE id > :last_id
+            ON CONFLICT (symbol) DO NOTHING
+        """), {"last_id": last_id})
+
+        hi = conn.execute(text("SELECT max(id) FROM option_quotes")).scalar()
+
+    if hi is None or hi <= last_id:
+        print(f"[COMPACT] up to date at id {last_id}")
+        return
+
+    lo = last_id
+    total = 0
+    while lo < hi:
+        end = min(lo + batch_rows, hi)
+
+        with engine.begin() as conn:
+            n = conn.execute(text(f"""
+                INSERT INTO option_quotes_compact (
+                    symbol_id, trade_date, option_symbol, root_id, cp, expiry, dte, term_group,
+                    strike, bid, ask, mid, iv, delta, gamma, vega, theta, volume, open_interest
+                )
+                SELECT
+                    s.id, q.trade_date, q.option_symbol, r.id,
+                    {_encode("q.cp", CP_CODES)},
+                    q.expiry, q.dte,
+                    {_encode("q.term_group", TERM_GROUP_CODES)},
+                    q.strike, q.bid, q.ask, q.mid, q.iv, q.delta, q.gamma, q.vega, q.theta,
+                    q.volume, q.open_interest
+                FROM option_quotes q
+                JOIN symbols s ON s.symbol = q.symbol
+                JOIN option_roots r ON r.root = q.option_root
+                WHERE q.id > :lo AND q.id <= :hi
+                ORDER BY q.symbol, q.trade_date
+                ON CONFLICT DO NOTHING
+            """), {"lo": lo, "hi": end}).rowcount
+
+            conn.execute(text(f"DELETE FROM {SYNC_STATE_TABLE}"))
+            conn.execute(text(f"INSERT INTO {SYNC_STATE_TABLE} (last_id) VALUES (:end)"), {"end": end})
+
+        total += n
+        print(f"[COMPACT] ids {lo + 1} → {end} rows={n} total={total}")
+        lo = end
+
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE option_quotes_compact"))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--migrate", action="store_true")
+    parser.add_argument("--batch-rows", type=int, default=MIGRATE_BATCH_ROWS)
+
+    args = parser.parse_args()
+
+    Symbol.__table__.create(bind=engine, checkfirst=True)
+    OptionRoot.__table__.create(bind=engine, checkfirst=True)
+    OptionQuoteCompact.__table__.create(bind=engine, checkfirst=True)
+
+    with engine.begin() as conn:
+        create_compact_view(conn)
+
+    print("option_roots / option_quotes_compact tables and view created (if not exists)")
+
+    if args.migrate:
+        migrate_to_compact(args.batch_rows)
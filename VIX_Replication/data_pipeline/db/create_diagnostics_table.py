@@ -0,0 +1,13 @@
+from sqlalchemy import text
+
+from .engine import engine
+from ..models.vix_diagnostics import VIXDiagnostics
+
+if __name__ == "__main__":
+    VIXDiagnostics.__table__.create(bind=engine, checkfirst=True)
+
+    # tables created before the vectorized calculator's prepare stage
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE vix_diagnostics ADD COLUMN IF NOT EXISTS t_prepare double precision"))
+
+    print("vix_diagnostics table created (if not exists)")
@@ -0,0 +1,6 @@
+from .engine import engine
+from ..models.expiry_variance import ExpiryVariance
+
+if __name__ == "__main__":
+    ExpiryVariance.__table__.create(bind=engine, checkfirst=True)
+    print("expiry_variances table created (if not exists)")
\ No newline at end of file
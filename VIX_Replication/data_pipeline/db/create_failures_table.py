@@ -0,0 +1,13 @@
+from sqlalchemy import text
+
+from .engine import engine
+from ..models.vix_failures import VIXFailure
+
+if __name__ == "__main__":
+    VIXFailure.__table__.create(bind=engine, checkfirst=True)
+
+    # tables created before failures were keyed on the rate inputs too
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE vix_failures ADD COLUMN IF NOT EXISTS rates_fingerprint varchar NOT NULL DEFAULT ''"))
+
+    print("vix_failures table created (if not exists)")
@@ -0,0 +1,6 @@
+from .engine import engine
+from ..models.vix_input_state import VIXInputState
+
+if __name__ == "__main__":
+    VIXInputState.__table__.create(bind=engine, checkfirst=True)
+    print("vix_input_state table created (if not exists)")
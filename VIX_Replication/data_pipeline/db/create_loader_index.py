@@ -0,0 +1,89 @@
+from sqlalchemy import text
+
+from .engine import engine
+
+TABLE = "option_quotes"
+LOADER_INDEX = "idx_quote_loader"
+LOADER_INDEX_DEF = "(symbol, trade_date, term_group, cp) INCLUDE (strike, bid, mid, dte)"
+
+def is_partitioned(conn, table: str) -> bool:
+    return conn.execute(text(
+        "SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass(:t)"
+    ), {"t": table}).scalar() is True
+
+def index_valid(conn, name: str):
+    # None when the index does not exist
+    return conn.execute(text(
+        "SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:n)"
+    ), {"n": name}).scalar()
+
+def create_partitioned_loader_index(conn):
+    '''
+    CONCURRENTLY is refused on a partitioned table, so the parent (and any
+    hash-bucketed year table) gets its index ON ONLY, which stays invalid,
+    each leaf partition is indexed concurrently, and the leaf indexes are
+    attached bottom-up. The parent index turns valid once every partition
+    has one attached; partitions created later inherit it.
+    '''
+    if index_valid(conn, LOADER_INDEX):
+        return
+
+    tree = conn.execute(text("""
+        SELECT c.relname, p.relname AS parent, t.isleaf, t.level
+        FROM pg_partition_tree(:t) t
+        JOIN pg_class c ON c.oid = t.relid
+        LEFT JOIN pg_class p ON p.oid = t.parentrelid
+        ORDER BY t.level DESC, c.relname
+    """), {"t": TABLE}).all()
+
+    def index_name(rel):
+        return LOADER_INDEX if rel == TABLE else f"{rel}_loader_idx"
+
+    for rel, _, isleaf, _ in tree:
+        if isleaf:
+            continue
+        conn.execute(text(
+            f"CREATE INDEX IF NOT EXISTS {index_name(rel)} ON ONLY {rel} {LOADER_INDEX_DEF}"
+        ))
+
+    for rel, _, isleaf, _ in tree:
+        if not isleaf:
+            continue
+        name = index_name(rel)
+
+        # an interrupted concurrent build leaves an invalid index behind
+        if index_valid(conn, name) is False:
+            conn.execute(text(f"DROP INDEX CONCURRENTLY {name}"))
+
+        conn.execute(text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {rel} {LOADER_INDEX_DEF}"))
+        print(f"[INDEX] {name}")
+
+    # deepest level first, so each intermediate index is valid before it is attached
+    for rel, parent, _, level in tree:
+        if level == 0:
+            continue
+        conn.execute(text(f"ALTER INDEX {index_name(parent)} ATTACH PARTITION {index_name(rel)}"))
+
+if __name__ == "__main__":
+    # CONCURRENTLY cannot run inside a transaction block
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        partitioned = is_partitioned(conn, TABLE)
+
+        if partitioned:
+            create_partitioned_loader_index(conn)
+        else:
+            conn.execute(text(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {LOADER_INDEX} ON {TABLE} {LOADER_INDEX_DEF}"
+            ))
+
+        # (symbol, trade_date) is a prefix of the loader index; keeping both
+        # only doubles index writes on every quote insert. A partitioned
+        # index cannot be dropped concurrently.
+        concurrently = "" if partitioned else " CONCURRENTLY"
+        conn.execute(text(f"DROP INDEX{concurrently} IF EXISTS idx_symbol_date"))
+
+        # index-only scans skip the heap only for pages marked all-visible;
+        # on a partitioned table this vacuums every partition
+        conn.execute(text(f"VACUUM (ANALYZE) {TABLE}"))
+
+    print(f"{LOADER_INDEX} created (if not exists), idx_symbol_date dropped")
@@ -3,6 +3,11 @@ from .engine import engine
 from ..models.symbols import Symbol
 from ..models.option_quotes import OptionQuote
 from ..models.daily_snapshot import DailySnapshot
+from ..models.expiry_variance import ExpiryVariance
+from ..models.vix_diagnostics import VIXDiagnostics
+from ..models.vix_uncertainty import VIXUncertainty
+from ..models.vix_failures import VIXFailure
+from ..models.vix_input_state import VIXInputState
 
 def create_all():
     # Base.metadata.drop_all(bind=engine)
@@ -0,0 +1,6 @@
+from .engine import engine
+from ..models.vix_uncertainty import VIXUncertainty
+
+if __name__ == "__main__":
+    VIXUncertainty.__table__.create(bind=engine, checkfirst=True)
+    print("vix_uncertainty table created (if not exists)")
\ No newline at end of file
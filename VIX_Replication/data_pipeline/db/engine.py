@@ -1,5 +1,6 @@
 import os
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 
@@ -7,5 +8,33 @@ load_dotenv()
 
 DB_URL = os.getenv('DB_URL')
 
+# Defaults to DB_URL with the asyncpg driver
+ASYNC_DB_URL = os.getenv('ASYNC_DB_URL')
+
 engine = create_engine(DB_URL, echo=False)
-SessionLocal = sessionmaker(bind=engine)
\ No newline at end of file
+SessionLocal = sessionmaker(bind=engine)
+
+_async_engine = None
+_async_sessionmaker = None
+
+def get_async_engine():
+    # Created on first use so sync-only callers never need asyncpg/greenlet
+    global _async_engine
+
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        url = ASYNC_DB_URL or make_url(DB_URL).set(drivername="postgresql+asyncpg")
+        _async_engine = create_async_engine(url, echo=False)
+
+    return _async_engine
+
+def get_async_sessionmaker():
+    global _async_sessionmaker
+
+    if _async_sessionmaker is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        _async_sessionmaker = async_sessionmaker(bind=get_async_engine(), expire_on_commit=False)
+
+    return _async_sessionmaker
@@ -0,0 +1,19 @@
+from sqlalchemy import text
+
+from .engine import engine
+
+if __name__ == "__main__":
+    with engine.begin() as conn:
+        conn.execute(text(
+            "ALTER TABLE daily_snapshots "
+            "ADD COLUMN IF NOT EXISTS call_done boolean NOT NULL DEFAULT false, "
+            "ADD COLUMN IF NOT EXISTS put_done boolean NOT NULL DEFAULT false"
+        ))
+
+        # days marked completed before per-side tracking count as both sides done
+        n = conn.execute(text(
+            "UPDATE daily_snapshots SET call_done = true, put_done = true "
+            "WHERE completed AND NOT (call_done AND put_done)"
+        )).rowcount
+
+    print(f"daily_snapshots call_done/put_done added (backfilled {n} rows)")
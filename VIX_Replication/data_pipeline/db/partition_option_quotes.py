@@ -0,0 +1,216 @@
+import argparse
+from datetime import date, timedelta
+from sqlalchemy import text
+
+from .engine import engine
+
+LIVE_TABLE = "option_quotes"
+PART_TABLE = "option_quotes_part"
+OLD_TABLE = "option_quotes_old"
+# max(id) of the live table when the last full migration started
+STATE_TABLE = "option_quotes_migration"
+
+MIGRATE_BATCH_DAYS = 31
+
+# live name -> name used on the partitioned table until the swap
+INDEX_NAMES = {
+    "option_quotes_pkey": "option_quotes_part_pkey",
+    "uq_optionquote": "uq_optionquote_part",
+    "idx_quote_loader": "idx_quote_loader_part",
+    "idx_trade_date_brin": "idx_trade_date_brin_part",
+}
+
+# a prefix of idx_quote_loader, so the partitioned table goes without it;
+# the old heap's copy is just renamed out of the way at the swap
+RETIRED_INDEXES = ("idx_symbol_date",)
+
+def year_partition(year: int):
+    return f"{LIVE_TABLE}_y{year}"
+
+def create_partitioned_table(conn, symbol_buckets: int = 0):
+    '''
+    Parent table partitioned by trade_date range. Unique keys must contain
+    every partition column, so the primary key becomes (id, trade_date[, symbol]).
+    '''
+    if conn.execute(text(f"SELECT to_regclass('{PART_TABLE}')")).scalar() is not None:
+        return
+
+    pk = "id, trade_date, symbol" if symbol_buckets else "id, trade_date"
+
+    conn.execute(text(
+        f"CREATE TABLE {PART_TABLE} (LIKE {LIVE_TABLE} INCLUDING DEFAULTS) "
+        f"PARTITION BY RANGE (trade_date)"
+    ))
+    conn.execute(text(
+        f"ALTER TABLE {PART_TABLE} ADD CONSTRAINT {INDEX_NAMES['option_quotes_pkey']} PRIMARY KEY ({pk})"
+    ))
+    conn.execute(text(
+        f"ALTER TABLE {PART_TABLE} ADD CONSTRAINT {INDEX_NAMES['uq_optionquote']} "
+        f"UNIQUE (symbol, trade_date, option_symbol)"
+    ))
+
+    # same covering index as OptionQuote declares for the loader
+    conn.execute(text(
+        f"CREATE INDEX {INDEX_NAMES['idx_quote_loader']} ON {PART_TABLE} "
+        f"(symbol, trade_date, term_group, cp) INCLUDE (strike, bid, mid, dte)"
+    ))
+    # rows arrive in trade_date order, which keeps the BRIN ranges tight
+    conn.execute(text(
+        f"CREATE INDEX {INDEX_NAMES['idx_trade_date_brin']} ON {PART_TABLE} USING brin (trade_date)"
+    ))
+
+    conn.execute(text(f"CREATE TABLE {LIVE_TABLE}_default PARTITION OF {PART_TABLE} DEFAULT"))
+
+def ensure_year_partition(conn, parent: str, year: int, symbol_buckets: int = 0):
+    name = year_partition(year)
+    sub = " PARTITION BY HASH (symbol)" if symbol_buckets else ""
+
+    conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {parent} "
+        f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01'){sub}"
+    ))
+
+    for i in range(symbol_buckets):
+        conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {name}_h{i} PARTITION OF {name} "
+            f"FOR VALUES WITH (MODULUS {symbol_buckets}, REMAINDER {i})"
+        ))
+
+def ensure_partitions(start_year: int, end_year: int, parent: str = LIVE_TABLE, symbol_buckets: int = 0):
+    # run ahead of each new year; rows otherwise land in the default partition
+    with engine.begin() as conn:
+        for year in range(start_year, end_year + 1):
+            ensure_year_partition(conn, parent, year, symbol_buckets)
+
+def migrate_batches(batch_days: int = MIGRATE_BATCH_DAYS):
+    '''
+    Copies option_quotes into the partitioned table one date window per
+    transaction. Re-running skips rows already copied. Once every window is
+    done, the live max(id) from before the copy is recorded for swap_tables:
+    anything inserted later, into any window, has a larger id.
+
+    Only inserts are caught up. Ingest never updates or deletes quotes, but
+    any manual UPDATE or DELETE on option_quotes between the start of the
+    migration and the swap is lost; hold those (or re-run the migration
+    from an empty partitioned table) until the swap is done.
+    '''
+    with engine.connect() as conn:
+        start_id, lo, hi = conn.execute(text(
+            f"SELECT coalesce(max(id), 0), min(trade_date), max(trade_date) FROM {LIVE_TABLE}"
+        )).one()
+
+    if lo is None:
+        print("[MIGRATE] option_quotes is empty")
+
+    d = lo
+    total = 0
+    while d is not None and d <= hi:
+        end = d + timedelta(days=batch_days)
+
+        with engine.begin() as conn:
+            n = conn.execute(text(
+                f"INSERT INTO {PART_TABLE} SELECT * FROM {LIVE_TABLE} "
+                f"WHERE trade_date >= :lo AND trade_date < :hi "
+                f"ORDER BY trade_date, symbol "
+                f"ON CONFLICT DO NOTHING"
+            ), {"lo": d, "hi": end}).rowcount
+
+        total += n
+        print(f"[MIGRATE] {d} → {end - timedelta(days=1)} rows={n} total={total}")
+        d = end
+
+    with engine.begin() as conn:
+        conn.execute(text(f"CREATE TABLE IF NOT EXISTS {STATE_TABLE} (start_id bigint NOT NULL)"))
+        conn.execute(text(f"DELETE FROM {STATE_TABLE}"))
+        conn.execute(text(f"INSERT INTO {STATE_TABLE} (start_id) VALUES (:start_id)"), {"start_id": start_id})
+
+    print(f"[MIGRATE] done; rows after id {start_id} are caught up at the swap")
+
+    vacuum_partitions(PART_TABLE)
+
+def vacuum_partitions(parent: str):
+    '''
+    Bulk-loaded pages are not all-visible until vacuumed, so index-only
+    scans on the loader index would still visit the heap. One partition per
+    statement keeps each run short; the parent is analyzed last for its
+    inheritance statistics.
+    '''
+    # VACUUM cannot run inside a transaction block
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        leaves = conn.execute(text(
+            "SELECT relid::regclass::text FROM pg_partition_tree(:t) WHERE isleaf ORDER BY 1"
+        ), {"t": parent}).scalars().all()
+
+        for leaf in leaves:
+            conn.execute(text(f"VACUUM (ANALYZE) {leaf}"))
+            print(f"[VACUUM] {leaf}")
+
+        conn.execute(text(f"ANALYZE {parent}"))
+
+def swap_tables(drop_old: bool = False):
+    '''
+    Catches up rows inserted since the migration and swaps the partitioned
+    table in under one exclusive lock (see migrate_batches for what is not
+    caught up). The old heap is kept as option_quotes_old
+    unless drop_old is set.
+    '''
+    with engine.begin() as conn:
+        if conn.execute(text(f"SELECT to_regclass('{STATE_TABLE}')")).scalar() is None:
+            raise RuntimeError("No completed migration recorded; run migrate_batches before swapping")
+
+        start_id = conn.execute(text(f"SELECT start_id FROM {STATE_TABLE}")).scalar()
+
+        conn.execute(text(f"LOCK TABLE {LIVE_TABLE} IN ACCESS EXCLUSIVE MODE"))
+
+        # part's own max(id) would come from the newest date window and miss
+        # rows backfilled into older windows during the migration
+        n = conn.execute(text(
+            f"INSERT INTO {PART_TABLE} SELECT * FROM {LIVE_TABLE} WHERE id > :start_id ON CONFLICT DO NOTHING"
+        ), {"start_id": start_id}).rowcount
+        print(f"[SWAP] caught up {n} rows written after id {start_id}")
+
+        seq = conn.execute(text(f"SELECT pg_get_serial_sequence('{LIVE_TABLE}', 'id')")).scalar()
+        if seq is not None:
+            conn.execute(text(f"ALTER SEQUENCE {seq} OWNED BY {PART_TABLE}.id"))
+
+        conn.execute(text(f"ALTER TABLE {LIVE_TABLE} RENAME TO {OLD_TABLE}"))
+        for live, part in INDEX_NAMES.items():
+            conn.execute(text(f"ALTER INDEX IF EXISTS {live} RENAME TO {live}_old"))
+            conn.execute(text(f"ALTER INDEX {part} RENAME TO {live}"))
+        for name in RETIRED_INDEXES:
+            conn.execute(text(f"ALTER INDEX IF EXISTS {name} RENAME TO {name}_old"))
+        conn.execute(text(f"ALTER TABLE {PART_TABLE} RENAME TO {LIVE_TABLE}"))
+        conn.execute(text(f"DROP TABLE {STATE_TABLE}"))
+
+        if drop_old:
+            conn.execute(text(f"DROP TABLE {OLD_TABLE}"))
+
+    print(f"[SWAP] {LIVE_TABLE} is now partitioned" + ("" if drop_old else f"; old heap kept as {OLD_TABLE}"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--start-year", type=int, default=2000)
+    parser.add_argument("--end-year", type=int, default=date.today().year + 1)
+    parser.add_argument("--symbol-buckets", type=int, default=0)
+    parser.add_argument("--batch-days", type=int, default=MIGRATE_BATCH_DAYS)
+    parser.add_argument("--skip-migrate", action="store_true")
+    parser.add_argument("--swap", action="store_true")
+    parser.add_argument("--drop-old", action="store_true")
+    parser.add_argument("--extend-only", action="store_true")
+
+    args = parser.parse_args()
+
+    if args.extend_only:
+        ensure_partitions(args.start_year, args.end_year, LIVE_TABLE, args.symbol_buckets)
+    else:
+        if not args.skip_migrate:
+            with engine.begin() as conn:
+                create_partitioned_table(conn, args.symbol_buckets)
+                for year in range(args.start_year, args.end_year + 1):
+                    ensure_year_partition(conn, PART_TABLE, year, args.symbol_buckets)
+
+            migrate_batches(args.batch_days)
+
+        if args.swap:
+            swap_tables(args.drop_old)
@@ -0,0 +1,29 @@
+import codecs
+
+# COPY through the raw DBAPI connection under either Postgres driver:
+# psycopg2 has cursor.copy_expert, psycopg (3) has the cursor.copy() context.
+# conn is a SQLAlchemy Connection.
+
+def copy_to_buffer(conn, sql: str, buf):
+    # sql is a COPY ... TO STDOUT statement; text lands in buf
+    with conn.connection.cursor() as cur:
+        if hasattr(cur, "copy_expert"):
+            cur.copy_expert(sql, buf)
+            return
+
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        with cur.copy(sql) as copy:
+            for chunk in copy:
+                buf.write(decoder.decode(bytes(chunk)))
+        buf.write(decoder.decode(b"", final=True))
+
+def copy_from_buffer(conn, sql: str, buf):
+    # sql is a COPY ... FROM STDIN statement; buf holds the text to load
+    with conn.connection.cursor() as cur:
+        if hasattr(cur, "copy_expert"):
+            cur.copy_expert(sql, buf)
+            return
+
+        with cur.copy(sql) as copy:
+            while data := buf.read(1 << 20):
+                copy.write(data)
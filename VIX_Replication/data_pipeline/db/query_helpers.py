@@ -1,7 +1,8 @@
-from sqlalchemy import func
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
 from datetime import datetime, date
 
-from .engine import SessionLocal
+from .engine import SessionLocal, get_async_sessionmaker
 from ..models.option_quotes import OptionQuote
 from ..models.symbols import Symbol
 from ..models.daily_snapshot import DailySnapshot
@@ -63,4 +64,101 @@ def mark_snapshot_done(symbol: str, trade_date: date):
             )
             s.add(rec)
 
-        s.commit()
\ No newline at end of file
+        s.commit()
+
+async def async_get_symbol_record(symbol: str):
+    async with get_async_sessionmaker()() as s:
+        return await s.scalar(select(Symbol).where(Symbol.symbol == symbol))
+
+async def async_create_symbol_if_not_exists(symbol: str, description=None):
+    async with get_async_sessionmaker()() as s:
+        await s.execute(
+            insert(Symbol)
+            .values(symbol=symbol, description=description, is_active=True)
+            .on_conflict_do_nothing(index_elements=["symbol"])
+        )
+        await s.commit()
+
+        return await s.scalar(select(Symbol).where(Symbol.symbol == symbol))
+
+async def async_exists_snapshot(symbol: str, trade_date: str, cp: str):
+    trade_date_obj = datetime.strptime(trade_date, "%Y-%m-%d").date()
+
+    async with get_async_sessionmaker()() as s:
+        row = await s.scalar(
+            select(OptionQuote.id)
+            .where(
+                OptionQuote.symbol == symbol,
+                OptionQuote.trade_date == trade_date_obj,
+                OptionQuote.cp == cp,
+            )
+            .limit(1)
+        )
+        return row is not None
+
+async def async_load_snapshot_state(symbol: str):
+    '''
+    One query for the symbol's whole ingestion history. Returns the set of
+    (trade_date, cp) already stored and the dates that are still partial.
+    '''
+    async with get_async_sessionmaker()() as s:
+        rows = (await s.execute(
+            select(
+                DailySnapshot.trade_date,
+                DailySnapshot.completed,
+                DailySnapshot.call_done,
+                DailySnapshot.put_done,
+            )
+            .where(DailySnapshot.symbol == symbol)
+        )).all()
+
+    done = set()
+    partial = []
+
+    for trade_date, completed, call_done, put_done in rows:
+        if completed or call_done:
+            done.add((trade_date, 'C'))
+        if completed or put_done:
+            done.add((trade_date, 'P'))
+        if not completed:
+            partial.append(trade_date)
+
+    return done, sorted(partial)
+
+async def async_mark_cps_done(symbol: str, trade_date: date, call_done: bool, put_done: bool):
+    # flags only ever go from false to true
+    async with get_async_sessionmaker()() as s:
+        stmt = insert(DailySnapshot).values(
+            symbol=symbol,
+            trade_date=trade_date,
+            call_done=call_done,
+            put_done=put_done,
+            completed=call_done and put_done,
+        )
+        call = DailySnapshot.call_done | stmt.excluded.call_done
+        put = DailySnapshot.put_done | stmt.excluded.put_done
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_daily_snapshot",
+            set_={"call_done": call, "put_done": put, "completed": call & put},
+        )
+
+        await s.execute(stmt)
+        await s.commit()
+
+async def async_set_first_option_date(symbol: str, trade_date: date):
+    async with get_async_sessionmaker()() as s:
+        await s.execute(
+            update(Symbol)
+            .where(Symbol.symbol == symbol, Symbol.first_option_date.is_(None))
+            .values(first_option_date=trade_date)
+        )
+        await s.commit()
+
+async def async_set_last_option_date(symbol: str, trade_date: date):
+    async with get_async_sessionmaker()() as s:
+        await s.execute(
+            update(Symbol)
+            .where(Symbol.symbol == symbol)
+            .values(last_option_date=trade_date)
+        )
+        await s.commit()
@@ -1,13 +1,15 @@
+import asyncio
 from datetime import datetime
 
 from .fetch_snapshot import fetch_option_snapshot, async_fetch_option_snapshot
 from ..db.engine import SessionLocal
 from ..models.symbols import Symbol
+from ..db.query_helpers import async_set_first_option_date
 
-def fetch_day(symbol: str, trade_date: str):
+def fetch_day(symbol: str, trade_date: str, keep_all_expiries: bool = False):
     results = {}
-    results['C'] = fetch_option_snapshot(symbol, trade_date, 'C')
-    results['P'] = fetch_option_snapshot(symbol, trade_date, 'P')
+    results['C'] = fetch_option_snapshot(symbol, trade_date, 'C', keep_all_expiries)
+    results['P'] = fetch_option_snapshot(symbol, trade_date, 'P', keep_all_expiries)
 
     with SessionLocal() as s:
         rec = s.query(Symbol).filter_by(symbol=symbol).first()
@@ -17,15 +19,20 @@ def fetch_day(symbol: str, trade_date: str):
 
     return results
 
-async def async_fetch_day(symbol: str, trade_date: str, session):
-    results = {}
-    results['C'] = await async_fetch_option_snapshot(symbol, trade_date, 'C', session)
-    results['P'] = await async_fetch_option_snapshot(symbol, trade_date, 'P', session)
+async def async_fetch_day(
+        symbol: str,
+        trade_date: str,
+        session,
+        keep_all_expiries: bool = False,
+        cps: tuple[str, ...] = ('C', 'P'),
+        probe: bool = True,
+):
+    fetched = await asyncio.gather(*[
+        async_fetch_option_snapshot(symbol, trade_date, cp, session, keep_all_expiries, probe)
+        for cp in cps
+    ])
+    results = dict(zip(cps, fetched))
 
-    with SessionLocal() as s:
-        rec = s.query(Symbol).filter_by(symbol=symbol).first()
-        if rec.first_option_date is None:
-            rec.first_option_date = datetime.strptime(trade_date, '%Y-%m-%d')
-            s.commit()
+    await async_set_first_option_date(symbol, datetime.strptime(trade_date, '%Y-%m-%d').date())
 
     return results
@@ -1,5 +1,6 @@
 import requests
 import os
+import logging
 from dotenv import load_dotenv
 import time
 import asyncio
@@ -8,9 +9,10 @@ import pandas as pd
 from io import BytesIO
 
 
-from ..db.engine import SessionLocal
-from ..db.query_helpers import exists_snapshot
-from .parse_and_insert import parse_and_insert_quotes
+from ..db.engine import SessionLocal, get_async_sessionmaker
+from ..db.query_helpers import exists_snapshot, async_exists_snapshot
+from ..utils import metrics
+from .parse_and_insert import parse_and_insert_quotes, async_parse_and_insert_quotes
 
 load_dotenv()
 
@@ -19,9 +21,14 @@ API_KEY = os.getenv('IVOL_API_KEY')
 
 MAX_RETRIES = 6
 
+# per-request events are counted in metrics; the messages are debug only
+log = logging.getLogger(__name__)
+
 def poll_download_info(detail_url, max_tries=10, delay=0.5):
     for _ in range(max_tries):
-        detail_json = requests.get(detail_url).json()
+        metrics.inc("detail_poll_attempts_total")
+        with metrics.span("detail_poll"):
+            detail_json = requests.get(detail_url).json()
         file_info = detail_json[0]["data"][0]
         url = file_info.get("urlForDownload")
         size = file_info.get("fileSize", 0)
@@ -41,8 +48,10 @@ async def poll_detail_until_ready(detail_url, session, timeout=180, interval=0.5
     sleep = interval
 
     while True:
-        async with session.get(detail_url) as resp:
-            data = await resp.json()
+        metrics.inc("detail_poll_attempts_total")
+        with metrics.span("detail_poll"):
+            async with session.get(detail_url) as resp:
+                data = await resp.json()
 
         # usual structure:
         #  [ { "data": [ { "urlForDownload": ... } ] } ]
@@ -63,28 +72,36 @@ async def poll_detail_until_ready(detail_url, session, timeout=180, interval=0.5
         sleep = min(sleep * 1.3, max_interval)
 
 def download_csv(download_url: str) -> pd.DataFrame:
-    resp = requests.get(download_url, timeout=15)
-    resp.raise_for_status()
-    df = pd.read_csv(BytesIO(resp.content), compression="gzip")
+    with metrics.span("csv_download"):
+        resp = requests.get(download_url, timeout=15)
+        resp.raise_for_status()
+
+    with metrics.span("csv_parse"):
+        df = pd.read_csv(BytesIO(resp.content), compression="gzip")
     return df
 
 async def async_download_csv(download_url: str, session: aiohttp.ClientSession) -> pd.DataFrame:
-    async with session.get(download_url, timeout=15) as resp:
-        resp.raise_for_status()
-        content = await resp.read()
+    with metrics.span("csv_download"):
+        async with session.get(download_url, timeout=15) as resp:
+            resp.raise_for_status()
+            content = await resp.read()
+
+    with metrics.span("csv_parse"):
         df = pd.read_csv(BytesIO(content), compression="gzip")
-        return df
+    return df
 
 def safe_request(url, params):
     retries = 0
 
     while retries <= MAX_RETRIES:
         try:
-            resp = requests.get(url, params=params, timeout=10)
+            with metrics.span("http_fetch"):
+                resp = requests.get(url, params=params, timeout=10)
 
             if resp.status_code == 429:
                 wait = 2 ** retries
-                print(f'[429] sleep {wait}s')
+                metrics.inc("http_retries_total", reason="429")
+                log.debug(f'[429] sleep {wait}s')
                 time.sleep(wait)
                 retries += 1
                 continue
@@ -94,14 +111,16 @@ def safe_request(url, params):
 
         except Exception as e:
             wait = 2 ** retries
-            print(f'[ERROR] {e}, sleep {wait}s')
+            metrics.inc("http_retries_total", reason="error")
+            log.debug(f'[ERROR] {e}, sleep {wait}s')
             time.sleep(wait)
             retries += 1
 
-    print('[ERROR] max retries exceeded')
+    metrics.inc("http_giveups_total")
+    log.debug('[ERROR] max retries exceeded')
     return None
 
-def fetch_option_snapshot(symbol: str, trade_date: str, cp: str):
+def fetch_option_snapshot(symbol: str, trade_date: str, cp: str, keep_all_expiries: bool = False):
     if exists_snapshot(
         symbol=symbol,
         trade_date=trade_date,
@@ -140,7 +159,7 @@ def fetch_option_snapshot(symbol: str, trade_date: str, cp: str):
 
         df = download_csv(download_url)
 
-    with SessionLocal() as session:
+    with SessionLocal() as session, metrics.span("db_insert", cp=cp):
 
         inserted = parse_and_insert_quotes(
             session=session, 
@@ -148,9 +167,11 @@ def fetch_option_snapshot(symbol: str, trade_date: str, cp: str):
             trade_date=trade_date,
             cp=cp,
             df=df,
+            keep_all_expiries=keep_all_expiries,
         )
 
-        print(f"[INFO] inserted {inserted} rows for {symbol} {trade_date} {cp}")
+        metrics.inc("quotes_inserted_total", inserted, cp=cp)
+        log.debug(f"[INFO] inserted {inserted} rows for {symbol} {trade_date} {cp}")
         return inserted
 
 sem = asyncio.Semaphore(5)
@@ -159,29 +180,43 @@ async def async_safe_request(url, params, session):
     retries = 0
     while retries <= MAX_RETRIES:
         try:
-            async with session.get(url, params=params, timeout=10) as resp:
-
-                if resp.status == 429:
-                    wait = 2 ** retries
-                    print(f'[429] sleep {wait}s')
-                    await asyncio.sleep(wait)
-                    retries += 1
-                    continue
-
-                resp.raise_for_status()
-                return await resp.json()
-            
+            # only the request/response is timed; backoff sleeps stay outside
+            with metrics.span("http_fetch"):
+                async with session.get(url, params=params, timeout=10) as resp:
+                    data = await resp.json() if resp.ok else None
+
+            if resp.status == 429:
+                wait = 2 ** retries
+                metrics.inc("http_retries_total", reason="429")
+                log.debug(f'[429] sleep {wait}s')
+                await asyncio.sleep(wait)
+                retries += 1
+                continue
+
+            resp.raise_for_status()
+            return data
+
         except Exception as e:
             wait = 2 ** retries
-            print(f'[NETWORK] {e}, sleep {wait}s')
+            metrics.inc("http_retries_total", reason="error")
+            log.debug(f'[NETWORK] {e}, sleep {wait}s')
             await asyncio.sleep(wait)
             retries += 1
 
-    print('[ERROR] async max retries exceeded')
+    metrics.inc("http_giveups_total")
+    log.debug('[ERROR] async max retries exceeded')
     return None
 
-async def async_fetch_option_snapshot(symbol: str, trade_date: str, cp: str, session):
-    if exists_snapshot(
+async def async_fetch_option_snapshot(
+        symbol: str,
+        trade_date: str,
+        cp: str,
+        session,
+        keep_all_expiries: bool = False,
+        probe: bool = True,
+):
+    # callers holding preloaded completion state pass probe=False
+    if probe and await async_exists_snapshot(
         symbol=symbol,
         trade_date=trade_date,
         cp=cp
@@ -217,15 +252,19 @@ async def async_fetch_option_snapshot(symbol: str, trade_date: str, cp: str, ses
 
             download_url = await poll_detail_until_ready(detail_url, session)
             df = await async_download_csv(download_url, session)
-        
-        with SessionLocal() as s:
-            inserted = parse_and_insert_quotes(
+
+    # the HTTP slot is released before the write so other fetches proceed
+    async with get_async_sessionmaker()() as s:
+        with metrics.span("db_insert", cp=cp):
+            inserted = await async_parse_and_insert_quotes(
                 session=s,
                 symbol=symbol,
                 trade_date=trade_date,
                 cp=cp,
-                df=df
+                df=df,
+                keep_all_expiries=keep_all_expiries,
             )
 
-        print(f"[INFO] inserted {inserted} rows for {symbol} {trade_date} {cp}")
-        return inserted
\ No newline at end of file
+    metrics.inc("quotes_inserted_total", inserted, cp=cp)
+    log.debug(f"[INFO] inserted {inserted} rows for {symbol} {trade_date} {cp}")
+    return inserted
\ No newline at end of file
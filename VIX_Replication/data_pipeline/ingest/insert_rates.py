@@ -1,7 +1,9 @@
 import pandas as pd
 import pandas_datareader.data as web
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
 
 from ..db.engine import SessionLocal
 from ..models.rates import RiskFreeRate
@@ -20,6 +22,13 @@ FRED_TO_TENOR = {
     "DGS30": "30Y",
 }
 
+DEFAULT_START_DATE = "2000-01-01"
+UPSERT_CHUNK_ROWS = 5000
+
+# incremental runs re-read this many days before the latest stored date so
+# tenors FRED publishes late and revised values are picked up
+REFETCH_DAYS = 10
+
 def ingest_fred_rates(
     start_date: str = "2000-01-01",
     end_date: Optional[str] = None,
@@ -90,4 +99,98 @@ def ingest_fred_rates(
 
     print(
         f"[DONE] Rates ingest finished | inserted={inserted}, skipped={skipped}"
-    )
\ No newline at end of file
+    )
+
+def load_fred_csv(csv_path: str, start_date: str, end_date: str):
+    '''
+    Reads a local FRED download (one column per series, '.' for missing)
+    into the same wide frame web.DataReader returns.
+    '''
+    df = pd.read_csv(csv_path, na_values=["."])
+    date_col = "observation_date" if "observation_date" in df.columns else "DATE"
+
+    df[date_col] = pd.to_datetime(df[date_col])
+    df = df.set_index(date_col).sort_index()
+
+    return df.loc[start_date:end_date]
+
+def fred_frame_to_rows(rates_df: pd.DataFrame):
+    cols = [c for c in FRED_TO_TENOR if c in rates_df.columns]
+
+    long = (
+        rates_df[cols]
+        .rename_axis("trade_date")
+        .reset_index()
+        .melt(id_vars="trade_date", var_name="fred_code", value_name="rate_bey")
+        .dropna(subset=["rate_bey"])
+    )
+    long["tenor"] = long["fred_code"].map(FRED_TO_TENOR)
+    long["trade_date"] = pd.to_datetime(long["trade_date"]).dt.date
+    long["rate_bey"] = long["rate_bey"].astype(float)
+
+    return long[["trade_date", "tenor", "rate_bey"]].to_dict("records")
+
+def latest_rate_date(session):
+    return session.query(func.max(RiskFreeRate.trade_date)).scalar()
+
+def ingest_fred_rates_bulk(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    csv_path: Optional[str] = None,
+    overwrite: bool = False,
+    chunk_size: int = UPSERT_CHUNK_ROWS,
+):
+    session = SessionLocal()
+
+    try:
+        if start_date is None:
+            latest = latest_rate_date(session)
+            start_date = (
+                (latest - timedelta(days=REFETCH_DAYS)).strftime("%Y-%m-%d")
+                if latest else DEFAULT_START_DATE
+            )
+            # the overlap window only helps if it can replace stored values
+            overwrite = True
+
+        if end_date is None:
+            end_date = datetime.today().strftime("%Y-%m-%d")
+
+        print(f"[INGEST] FRED rates {start_date} → {end_date} ({csv_path or 'web'})")
+
+        if csv_path is not None:
+            rates_df = load_fred_csv(csv_path, start_date, end_date)
+        else:
+            rates_df = web.DataReader(
+                list(FRED_TO_TENOR.keys()),
+                "fred",
+                start=start_date,
+                end=end_date,
+            )
+
+        rows = fred_frame_to_rows(rates_df)
+        written = 0
+
+        for i in range(0, len(rows), chunk_size):
+            stmt = insert(RiskFreeRate).values(rows[i:i + chunk_size])
+
+            if overwrite:
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["trade_date", "tenor"],
+                    set_={"rate_bey": stmt.excluded.rate_bey},
+                    # unchanged rows are left alone and not counted as written
+                    where=RiskFreeRate.rate_bey.is_distinct_from(stmt.excluded.rate_bey),
+                )
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=["trade_date", "tenor"])
+
+            written += session.execute(stmt).rowcount
+
+        session.commit()
+
+    finally:
+        session.close()
+
+    print(
+        f"[DONE] Rates bulk ingest finished | rows={len(rows)}, written={written}, "
+        f"skipped={len(rows) - written}"
+    )
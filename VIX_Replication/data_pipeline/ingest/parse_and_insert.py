@@ -1,18 +1,20 @@
+import asyncio
 from datetime import datetime
 from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+import numpy as np
 import pandas as pd
 
 from ..models.option_quotes import OptionQuote
 
-def parse_and_insert_quotes(
-        session: Session, 
+def build_quote_rows(
         symbol: str,
         trade_date: str,
-        cp: str,
-        df: pd.DataFrame
+        df: pd.DataFrame,
+        keep_all_expiries: bool = False,
     ):
     if df is None or df.empty:
-        return 0
+        return []
     
     trade_date_obj = datetime.strptime(trade_date, '%Y-%m-%d').date()
 
@@ -41,14 +43,15 @@ def parse_and_insert_quotes(
         return 'other'
 
     df["term_group"] = df["dte"].apply(classify)
-    df = df[df["term_group"] != "other"].copy()
+    if not keep_all_expiries:
+        df = df[df["term_group"] != "other"].copy()
 
     if df.empty:
-        return 0
+        return []
     
     df["option_root"] = df["option_symbol"].str.extract(r'^([A-Z]+)')
     
-    inserted = 0
+    rows = []
 
     for _, row in df.iterrows():
         bid = row["Bid"]
@@ -56,38 +59,89 @@ def parse_and_insert_quotes(
         mid = (bid + ask) / 2 if bid is not None and ask is not None else row["price"]
 
         try:
-            session.add(
-                OptionQuote(
-                    symbol=symbol,
-                    trade_date=trade_date_obj,
-                    option_symbol=row["option_symbol"],
-                    option_root=row["option_root"],
-
-                    cp=row['call_put'],
-                    expiry=row["expiration_date"],
-                    dte=row['dte'],
-                    term_group=row['term_group'],
-                    strike=row['price_strike'],
-                    
-                    bid=bid,
-                    ask=ask,
-                    mid=mid,
-
-                    iv=row['iv'],
-                    delta=row['delta'],
-                    gamma=row['gamma'],
-                    vega=row['vega'],
-                    theta=row['theta'],
-
-                    volume=row['volume'],
-                    open_interest=row['openinterest'],
-                )
-            )
-            
-            inserted += 1
-            
+            rows.append(dict(
+                symbol=symbol,
+                trade_date=trade_date_obj,
+                option_symbol=row["option_symbol"],
+                option_root=row["option_root"],
+
+                cp=row['call_put'],
+                expiry=row["expiration_date"],
+                dte=row['dte'],
+                term_group=row['term_group'],
+                strike=row['price_strike'],
+
+                bid=bid,
+                ask=ask,
+                mid=mid,
+
+                iv=row['iv'],
+                delta=row['delta'],
+                gamma=row['gamma'],
+                vega=row['vega'],
+                theta=row['theta'],
+
+                volume=row['volume'],
+                open_interest=row['openinterest'],
+            ))
+
         except Exception as e:
            print(f'[WARNING] skip item: {e}')
 
+    return rows
+
+def parse_and_insert_quotes(
+        session: Session, 
+        symbol: str,
+        trade_date: str,
+        cp: str,
+        df: pd.DataFrame,
+        keep_all_expiries: bool = False,
+    ):
+    rows = build_quote_rows(symbol, trade_date, df, keep_all_expiries)
+    if not rows:
+        return 0
+
+    for row in rows:
+        session.add(OptionQuote(**row))
+
     session.commit()
-    return inserted
\ No newline at end of file
+    return len(rows)
+
+# pandas upcasts these to float64 as soon as one value is missing
+INT_COLUMNS = {"dte", "volume", "open_interest"}
+
+def _plain(key, value):
+    # asyncpg only encodes builtin types, and only the column's own type
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None or pd.isna(value):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.date()
+    if key in INT_COLUMNS:
+        return int(value)
+    return value
+
+async def async_parse_and_insert_quotes(
+        session,
+        symbol: str,
+        trade_date: str,
+        cp: str,
+        df: pd.DataFrame,
+        keep_all_expiries: bool = False,
+    ):
+    # row building is CPU work; keep it off the event loop
+    rows = await asyncio.to_thread(build_quote_rows, symbol, trade_date, df, keep_all_expiries)
+    if not rows:
+        return 0
+
+    rows = [{k: _plain(k, v) for k, v in row.items()} for row in rows]
+
+    # rows skipped by ON CONFLICT return no id, so this counts real inserts
+    stmt = insert(OptionQuote).on_conflict_do_nothing(constraint="uq_optionquote").returning(OptionQuote.id)
+    result = await session.execute(stmt, rows)
+    inserted = len(result.all())
+    await session.commit()
+
+    return inserted
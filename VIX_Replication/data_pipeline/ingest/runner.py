@@ -5,6 +5,7 @@ from tqdm.auto import tqdm
 
 from .update import async_update_symbol
 from ..utils.calendar import TRADE_DATES
+from ..utils import metrics
 
 
 def count_days(start_date: date):
@@ -12,7 +13,7 @@ def count_days(start_date: date):
     return len([d for d in TRADE_DATES if start_date <= d <= today])
 
 
-async def run_ingestion(symbols, start_date):
+async def run_ingestion(symbols, start_date, keep_all_expiries=False):
 
     symbol_bar = tqdm(
         total=len(symbols),
@@ -37,7 +38,7 @@ async def run_ingestion(symbols, start_date):
         def day_callback():
             day_bar.update(1)
 
-        await async_update_symbol(sym, start_date, day_callback)
+        await async_update_symbol(sym, start_date, day_callback, keep_all_expiries)
 
         day_bar.close()
         symbol_bar.update()
@@ -54,8 +55,21 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--symbols", "-s", nargs="+", required=True)
     parser.add_argument("--start", "-t", required=True)
+    parser.add_argument("--all-expiries", action="store_true")
+    parser.add_argument("--metrics-file")
+    parser.add_argument("--metrics-port", type=int)
 
     args = parser.parse_args()
     start_date = parse_date(args.start)
 
-    asyncio.run(run_ingestion(args.symbols, start_date))
+    metrics.configure_from_env()
+    if args.metrics_file:
+        metrics.enable_metrics()
+    if args.metrics_port:
+        metrics.serve_metrics(args.metrics_port)
+
+    asyncio.run(run_ingestion(args.symbols, start_date, args.all_expiries))
+
+    if args.metrics_file:
+        metrics.write_metrics(args.metrics_file)
+        print(f"[METRICS] written to {args.metrics_file}")
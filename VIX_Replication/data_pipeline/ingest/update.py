@@ -4,11 +4,22 @@ import asyncio
 
 from ..utils.calendar import TRADE_DATES
 from ..db.query_helpers import get_symbol_record, create_symbol_if_not_exists, snapshot_done, mark_snapshot_done
+from ..db.query_helpers import (
+    async_get_symbol_record,
+    async_create_symbol_if_not_exists,
+    async_load_snapshot_state,
+    async_mark_cps_done,
+    async_set_last_option_date,
+)
 from ..ingest.fetch_day import fetch_day, async_fetch_day
 from ..db.engine import SessionLocal
 from ..models.symbols import Symbol
+from ..utils import metrics
 
-def update_symbol(symbol: str, start_date: date):
+# trade dates fetched concurrently per symbol
+INGEST_WINDOW_DAYS = 10
+
+def update_symbol(symbol: str, start_date: date, keep_all_expiries: bool = False):
     rec = get_symbol_record(symbol)
     if rec is None:
         rec = create_symbol_if_not_exists(symbol)
@@ -37,7 +48,9 @@ def update_symbol(symbol: str, start_date: date):
             d += timedelta(days=1)
             continue
 
-        result = fetch_day(symbol, d.strftime('%Y-%m-%d'))
+        with metrics.span("ingest_day"):
+            result = fetch_day(symbol, d.strftime('%Y-%m-%d'), keep_all_expiries)
+        metrics.inc("days_ingested_total")
 
         mark_snapshot_done(symbol, d)
 
@@ -49,10 +62,10 @@ def update_symbol(symbol: str, start_date: date):
         print(f'[OK] {symbol} {d}')
         d += timedelta(days=1)
 
-async def async_update_symbol(symbol: str, start_date: date, day_callback=None):
-    rec = get_symbol_record(symbol)
+async def async_update_symbol(symbol: str, start_date: date, day_callback=None, keep_all_expiries: bool = False):
+    rec = await async_get_symbol_record(symbol)
     if rec is None:
-        rec = create_symbol_if_not_exists(symbol)
+        rec = await async_create_symbol_if_not_exists(symbol)
 
     if not rec.is_active:
         print(f'[INFO] {symbol} is inactive. Skip.')
@@ -63,44 +76,62 @@ async def async_update_symbol(symbol: str, start_date: date, day_callback=None):
     else:
         d = start_date
 
+    # completion state for the whole history in one query; partial days
+    # before the resume point are retried for their missing side only
+    done, partial = await async_load_snapshot_state(symbol)
+
+    async def ingest(http_sess, day):
+        cps = tuple(cp for cp in ('C', 'P') if (day, cp) not in done)
+        if not cps:
+            return False
+
+        with metrics.span("ingest_day"):
+            results = await async_fetch_day(
+                symbol, day.strftime("%Y-%m-%d"), http_sess, keep_all_expiries, cps, probe=False,
+            )
+        metrics.inc("days_ingested_total")
+
+        # None means the fetch failed; that side stays pending
+        for cp, result in results.items():
+            if result is not None:
+                done.add((day, cp))
+
+        await async_mark_cps_done(symbol, day, (day, 'C') in done, (day, 'P') in done)
+        return True
+
     async with aiohttp.ClientSession() as http_sess:
 
-        while True:
-            today = date.today()
-            if d > today:
-                print(f'[DONE] {symbol} up to date.')
-                break
-
-            if d not in TRADE_DATES:
-                d += timedelta(days=1)
-                continue
-
-            if snapshot_done(symbol, d):
-                d += timedelta(days=1)
-                continue
-
-            await async_fetch_day(symbol, d.strftime("%Y-%m-%d"), http_sess)
-            
-            mark_snapshot_done(symbol, d)
-
-            with SessionLocal() as s:
-                rec_db = s.query(Symbol).filter_by(symbol=symbol).first()
-                rec_db.last_option_date = d
-                s.commit()
-            
-            if day_callback:
-                day_callback()
-
-            print(f'[OK] {symbol} {d}')
-            d += timedelta(days=1)
+        stale = [p for p in partial if p < d]
+        for p, ingested in zip(stale, await asyncio.gather(*[ingest(http_sess, p) for p in stale])):
+            if ingested:
+                print(f'[RESUME] {symbol} {p}')
+
+        today = date.today()
+        days = sorted(t for t in TRADE_DATES if d <= t <= today)
+
+        # days in a window are fetched together (the snapshot semaphore bounds
+        # the requests in flight); the resume point moves past whole windows
+        for i in range(0, len(days), INGEST_WINDOW_DAYS):
+            window = days[i:i + INGEST_WINDOW_DAYS]
+            ingested = await asyncio.gather(*[ingest(http_sess, day) for day in window])
+
+            for day, ok in zip(window, ingested):
+                if ok:
+                    if day_callback:
+                        day_callback()
+                    print(f'[OK] {symbol} {day}')
+
+            await async_set_last_option_date(symbol, window[-1])
+
+        print(f'[DONE] {symbol} up to date.')
 
-def update_all(symbols: list, start_date: date):
+def update_all(symbols: list, start_date: date, keep_all_expiries: bool = False):
     for s in symbols:
-        update_symbol(s, start_date)
+        update_symbol(s, start_date, keep_all_expiries)
 
-async def async_update_all(symbols: list, start_date: date):
+async def async_update_all(symbols: list, start_date: date, keep_all_expiries: bool = False):
     tasks = [
-        asyncio.create_task(async_update_symbol(sym, start_date))
+        asyncio.create_task(async_update_symbol(sym, start_date, keep_all_expiries=keep_all_expiries))
         for sym in symbols
     ]
     await asyncio.gather(*tasks)
\ No newline at end of file
@@ -10,6 +10,11 @@ class DailySnapshot(Base):
     trade_date = Column(Date, nullable=False)
 
     completed = Column(Boolean, default=False)
+
+    # per-side completion; completed is set once both are done
+    call_done = Column(Boolean, nullable=False, server_default='false')
+    put_done = Column(Boolean, nullable=False, server_default='false')
+
     created_at = Column(DateTime, server_default=func.now())
 
     __table_args__ = (
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, Index
+from sqlalchemy.sql import func
+from .base import Base
+
+class ExpiryVariance(Base):
+    __tablename__ = 'expiry_variances'
+
+    id = Column(Integer, primary_key=True)
+    symbol = Column(String, nullable=False)
+    trade_date = Column(Date, nullable=False)
+
+    dte = Column(Integer, nullable=False)
+    t = Column(Float, nullable=False)
+    r = Column(Float)
+
+    forward = Column(Float)
+    k0 = Column(Float)
+    n_strikes = Column(Integer)
+    variance = Column(Float, nullable=False)
+
+    created_at = Column(DateTime, server_default=func.now())
+
+    __table_args__ = (
+        Index(
+            'ix_expvar_symbol_date_dte',
+            'symbol',
+            'trade_date',
+            'dte',
+            unique=True
+        ),
+    )
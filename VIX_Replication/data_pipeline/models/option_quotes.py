@@ -38,7 +38,12 @@ class OptionQuote(Base):
     created_at = Column(DateTime, server_default=func.now())
 
     __table_args__ = (
-        Index('idx_symbol_date', 'symbol', 'trade_date'),
+        # matches load_day_chain so a day's chain is an index-only scan
+        Index(
+            'idx_quote_loader',
+            'symbol', 'trade_date', 'term_group', 'cp',
+            postgresql_include=['strike', 'bid', 'mid', 'dte'],
+        ),
         UniqueConstraint(
             'symbol', 'trade_date', 'option_symbol',
             name='uq_optionquote'
@@ -0,0 +1,58 @@
+from sqlalchemy import (
+    Column, Integer, BigInteger, SmallInteger, Float, REAL, String, Date,
+    ForeignKey, Index, UniqueConstraint,
+)
+from .base import Base
+
+# smallint codes stored in place of the free-text columns of option_quotes
+CP_CODES = {"C": 0, "P": 1}
+TERM_GROUP_CODES = {"other": 0, "near30": 1, "next30": 2, "near90": 3, "next90": 4}
+
+# read view exposing option_quotes column names over the compact table;
+# a snapshot of option_quotes as of the last create_compact_tables --migrate
+COMPACT_VIEW = "option_quotes_compact_v"
+
+class OptionRoot(Base):
+    __tablename__ = 'option_roots'
+
+    id = Column(SmallInteger, primary_key=True)
+    root = Column(String, unique=True, nullable=False)
+
+class OptionQuoteCompact(Base):
+    __tablename__ = 'option_quotes_compact'
+
+    id = Column(BigInteger, primary_key=True)
+
+    symbol_id = Column(Integer, ForeignKey('symbols.id'), nullable=False)
+    trade_date = Column(Date, nullable=False)
+
+    option_symbol = Column(String, nullable=False)
+    root_id = Column(SmallInteger, ForeignKey('option_roots.id'), nullable=False)
+
+    cp = Column(SmallInteger, nullable=False)
+    expiry = Column(Date, nullable=False)
+    dte = Column(SmallInteger, nullable=False)
+    term_group = Column(SmallInteger, nullable=False)
+
+    # prices stay float8: they feed the forward and strip sums directly
+    strike = Column(Float, nullable=False)
+    bid = Column(Float)
+    ask = Column(Float)
+    mid = Column(Float)
+
+    iv = Column(REAL)
+    delta = Column(REAL)
+    gamma = Column(REAL)
+    vega = Column(REAL)
+    theta = Column(REAL)
+
+    volume = Column(Integer)
+    open_interest = Column(Integer)
+
+    __table_args__ = (
+        Index('idx_compact_symbol_date', 'symbol_id', 'trade_date'),
+        UniqueConstraint(
+            'symbol_id', 'trade_date', 'option_symbol',
+            name='uq_optionquote_compact'
+        ),
+    )
@@ -0,0 +1,44 @@
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, Index
+from sqlalchemy.sql import func
+from .base import Base
+
+class VIXDiagnostics(Base):
+    __tablename__ = 'vix_diagnostics'
+
+    id = Column(Integer, primary_key=True)
+    symbol = Column(String, nullable=False)
+    trade_date = Column(Date, nullable=False)
+    index_type = Column(String, nullable=False)
+
+    # stage wall times, seconds
+    t_load = Column(Float)
+    t_rates = Column(Float)
+    t_prepare = Column(Float)
+    t_calc_K0 = Column(Float)
+    t_construct = Column(Float)
+    t_contribution = Column(Float)
+    t_total = Column(Float)
+
+    forward_near = Column(Float)
+    forward_next = Column(Float)
+    k0_near = Column(Float)
+    k0_next = Column(Float)
+
+    n_strikes_near = Column(Integer)
+    n_strikes_next = Column(Integer)
+    put_cutoff_near = Column(Integer)
+    call_cutoff_near = Column(Integer)
+    put_cutoff_next = Column(Integer)
+    call_cutoff_next = Column(Integer)
+
+    created_at = Column(DateTime, server_default=func.now())
+
+    __table_args__ = (
+        Index(
+            'ix_vixdiag_symbol_date',
+            'symbol',
+            'trade_date',
+            'index_type',
+            unique=True
+        ),
+    )
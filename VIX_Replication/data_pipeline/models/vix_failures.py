@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, String, Date, DateTime, Index
+from sqlalchemy.sql import func
+from .base import Base
+
+class VIXFailure(Base):
+    __tablename__ = 'vix_failures'
+
+    id = Column(Integer, primary_key=True)
+    symbol = Column(String, nullable=False)
+    trade_date = Column(Date, nullable=False)
+    index_type = Column(String, nullable=False)
+
+    reason = Column(String, nullable=False)
+
+    # inputs when the failure was recorded: option_quotes "count:max(id)"
+    # and the md5 of the rates in the lookback window (see staleness)
+    fingerprint = Column(String, nullable=False)
+    rates_fingerprint = Column(String, nullable=False, server_default='')
+
+    created_at = Column(DateTime, server_default=func.now())
+
+    __table_args__ = (
+        Index(
+            'ix_vixfail_symbol_date',
+            'symbol',
+            'trade_date',
+            'index_type',
+            unique=True
+        ),
+    )
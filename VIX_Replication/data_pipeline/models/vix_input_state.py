@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, String, Date, DateTime, Boolean, Index
+from sqlalchemy.sql import func
+from .base import Base
+
+class VIXInputState(Base):
+    __tablename__ = 'vix_input_state'
+
+    id = Column(Integer, primary_key=True)
+    symbol = Column(String, nullable=False)
+    trade_date = Column(Date, nullable=False)
+    index_type = Column(String, nullable=False)
+
+    # inputs the stored vix_index_values row was computed from
+    quotes_fingerprint = Column(String, nullable=False)
+    rates_fingerprint = Column(String, nullable=False)
+
+    is_stale = Column(Boolean, nullable=False, server_default='false')
+
+    updated_at = Column(DateTime, server_default=func.now())
+
+    __table_args__ = (
+        Index(
+            'ix_vixstate_symbol_date',
+            'symbol',
+            'trade_date',
+            'index_type',
+            unique=True
+        ),
+        Index('ix_vixstate_stale', 'symbol', 'index_type', 'is_stale'),
+    )
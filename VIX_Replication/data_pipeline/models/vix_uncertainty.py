@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, Index
+from sqlalchemy.sql import func
+from .base import Base
+
+class VIXUncertainty(Base):
+    __tablename__ = 'vix_uncertainty'
+
+    id = Column(Integer, primary_key=True)
+    symbol = Column(String, nullable=False)
+    trade_date = Column(Date, nullable=False)
+    index_type = Column(String, nullable=False)
+
+    n_draws = Column(Integer, nullable=False)
+    vix_mean = Column(Float)
+    vix_std = Column(Float)
+    vix_p05 = Column(Float)
+    vix_p50 = Column(Float)
+    vix_p95 = Column(Float)
+
+    created_at = Column(DateTime, server_default=func.now())
+
+    __table_args__ = (
+        Index(
+            'ix_vixunc_symbol_date',
+            'symbol',
+            'trade_date',
+            'index_type',
+            unique=True
+        ),
+    )
@@ -0,0 +1,188 @@
+import json
+import os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from datetime import date
+from pathlib import Path
+from sqlalchemy import select, func
+
+from ..db.engine import SessionLocal
+from ..models.option_quotes import OptionQuote
+from ..compute.loader import LOADER_COLUMNS, copy_select
+from ..compute.staleness import quotes_fingerprint
+
+# Columns exported per quote; enough for the calculators and for research
+STORE_COLUMNS = (
+    "term_group", "cp", "dte", "strike",
+    "bid", "ask", "mid",
+    "iv", "delta", "gamma", "vega", "theta",
+    "volume", "open_interest",
+)
+
+# per-symbol map of trade_date -> quotes fingerprint at export; the leading
+# underscore keeps it out of pyarrow dataset discovery
+FINGERPRINTS_FILE = "_fingerprints.json"
+
+# fingerprints are flushed this often during a sync
+FINGERPRINT_FLUSH_DAYS = 100
+
+class ParquetChainStore:
+    '''
+    Columnar copy of option_quotes, one Parquet file per trade date under
+    root/symbol=<SYMBOL>/year=<YYYY>/. Reads are memory-mapped and only
+    touch the requested columns and row groups.
+    '''
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+
+    def _symbol_dir(self, symbol: str):
+        return self.root / f"symbol={symbol}"
+
+    def _day_path(self, symbol: str, trade_date: date):
+        return self._symbol_dir(symbol) / f"year={trade_date.year}" / f"{trade_date.isoformat()}.parquet"
+
+    def trade_dates(self, symbol: str):
+        return sorted(
+            date.fromisoformat(p.stem)
+            for p in self._symbol_dir(symbol).glob("year=*/*.parquet")
+        )
+
+    def last_date(self, symbol: str):
+        dates = self.trade_dates(symbol)
+        return dates[-1] if dates else None
+
+    def fingerprints(self, symbol: str):
+        path = self._symbol_dir(symbol) / FINGERPRINTS_FILE
+        if not path.exists():
+            return {}
+        return {date.fromisoformat(d): fp for d, fp in json.loads(path.read_text()).items()}
+
+    def save_fingerprints(self, symbol: str, fingerprints: dict):
+        path = self._symbol_dir(symbol) / FINGERPRINTS_FILE
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp = path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps({d.isoformat(): fp for d, fp in sorted(fingerprints.items())}))
+        os.replace(tmp, path)
+
+    def remove_day(self, symbol: str, trade_date: date):
+        self._day_path(symbol, trade_date).unlink(missing_ok=True)
+
+    def write_day(self, symbol: str, trade_date: date, df: pd.DataFrame):
+        path = self._day_path(symbol, trade_date)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        table = pa.Table.from_pandas(
+            df.assign(trade_date=trade_date).sort_values(["term_group", "cp", "strike"]),
+            preserve_index=False,
+        )
+
+        # write-then-rename so readers never see a partial file
+        tmp = path.with_suffix(".parquet.tmp")
+        pq.write_table(table, tmp)
+        os.replace(tmp, path)
+
+    def _filters(self, term_groups):
+        filters = [("cp", "in", ["C", "P"])]
+        if term_groups is not None:
+            filters.append(("term_group", "in", list(term_groups)))
+        return filters
+
+    def load_day_chain(
+            self,
+            symbol: str,
+            trade_date: date,
+            term_groups: tuple[str, ...] | None = None,
+            columns: tuple[str, ...] = LOADER_COLUMNS,
+    ):
+        path = self._day_path(symbol, trade_date)
+        if not path.exists():
+            return pd.DataFrame(columns=list(columns))
+
+        table = pq.read_table(
+            path,
+            columns=list(columns),
+            filters=self._filters(term_groups),
+            memory_map=True,
+        )
+        return table.to_pandas()
+
+    def iter_day_chains(
+            self,
+            symbol: str,
+            term_groups: tuple[str, ...] | None = None,
+            start_date: date | None = None,
+            end_date: date | None = None,
+            columns: tuple[str, ...] = ("trade_date",) + LOADER_COLUMNS,
+    ):
+        '''
+        Same contract as compute.batch.iter_day_chains, served from local files.
+        '''
+        cols = tuple(c for c in columns if c != "trade_date")
+
+        for d in self.trade_dates(symbol):
+            if start_date is not None and d < start_date:
+                continue
+            if end_date is not None and d > end_date:
+                continue
+
+            day = self.load_day_chain(symbol, d, term_groups, cols)
+            if not day.empty:
+                yield d, day.assign(trade_date=d)
+
+    def scan(self, symbol: str, columns: list[str] | None = None, filter=None):
+        '''
+        Whole-history research scan as a single Arrow table.
+        '''
+        dataset = ds.dataset(self._symbol_dir(symbol), format="parquet", partitioning="hive")
+        return dataset.to_table(columns=columns, filter=filter)
+
+def sync_from_postgres(store: ParquetChainStore, symbol: str, end_date: date | None = None):
+    '''
+    Brings the store in line with option_quotes. Days whose quotes
+    fingerprint differs from the one recorded at export (new, re-ingested or
+    backfilled) are rewritten; days no longer in Postgres are removed.
+    '''
+    known = store.fingerprints(symbol)
+
+    with SessionLocal() as session:
+        stmt = (
+            select(OptionQuote.trade_date, quotes_fingerprint(OptionQuote.__table__))
+            .where(OptionQuote.symbol == symbol)
+            .group_by(OptionQuote.trade_date)
+            .order_by(OptionQuote.trade_date)
+        )
+        if end_date is not None:
+            stmt = stmt.where(OptionQuote.trade_date <= end_date)
+
+        current = dict(session.execute(stmt).all())
+
+        changed = [d for d, fp in current.items() if known.get(d) != fp]
+        gone = [d for d in known if d not in current and (end_date is None or d <= end_date)]
+        print(f"[SYNC] {symbol} {len(changed)} new or changed dates, {len(gone)} removed")
+
+        for d in gone:
+            store.remove_day(symbol, d)
+            del known[d]
+
+        for i, d in enumerate(changed, 1):
+            day_stmt = (
+                select(*[getattr(OptionQuote, c) for c in STORE_COLUMNS])
+                .where(
+                    OptionQuote.symbol == symbol,
+                    OptionQuote.trade_date == d,
+                )
+            )
+            df = copy_select(session, day_stmt, STORE_COLUMNS)
+            store.write_day(symbol, d, df)
+            known[d] = current[d]
+
+            print(f"[OK] {symbol} {d} rows={len(df)}")
+
+            if i % FINGERPRINT_FLUSH_DAYS == 0:
+                store.save_fingerprints(symbol, known)
+
+    store.save_fingerprints(symbol, known)
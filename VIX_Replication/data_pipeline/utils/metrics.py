@@ -0,0 +1,186 @@
+import atexit
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Read by configure_from_env(), which only entry points call:
+# VIX_METRICS=1 turns collection on; VIX_METRICS_FILE / VIX_METRICS_PORT
+# also enable it and export on exit / over HTTP
+METRICS_ENV = "VIX_METRICS"
+METRICS_FILE_ENV = "VIX_METRICS_FILE"
+METRICS_PORT_ENV = "VIX_METRICS_PORT"
+
+PREFIX = "vix_pipeline_"
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_lock = threading.Lock()
+_counters = {}
+_histograms = {}
+_enabled = False
+
+_NULL_SPAN = nullcontext()
+
+def metrics_enabled():
+    return _enabled
+
+def enable_metrics():
+    global _enabled
+    _enabled = True
+
+def reset_metrics():
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+def drain():
+    '''
+    Returns and clears everything collected so far, for a worker process
+    to hand back to the parent (see merge).
+    '''
+    with _lock:
+        counters = dict(_counters)
+        histograms = {k: (list(v[0]), v[1], v[2]) for k, v in _histograms.items()}
+        _counters.clear()
+        _histograms.clear()
+
+    return counters, histograms
+
+def merge(collected):
+    counters, histograms = collected
+
+    with _lock:
+        for key, value in counters.items():
+            _counters[key] = _counters.get(key, 0) + value
+
+        for key, (buckets, total, count) in histograms.items():
+            h = _histograms.get(key)
+            if h is None:
+                h = _histograms[key] = [[0] * (len(DEFAULT_BUCKETS) + 1), 0.0, 0]
+
+            h[0] = [a + b for a, b in zip(h[0], buckets)]
+            h[1] += total
+            h[2] += count
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+def inc(name: str, value: float = 1, **labels):
+    if not _enabled:
+        return
+
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+def observe(name: str, value: float, **labels):
+    if not _enabled:
+        return
+
+    key = _key(name, labels)
+    with _lock:
+        h = _histograms.get(key)
+        if h is None:
+            # per-bucket counts (last slot is +Inf), sum, count
+            h = _histograms[key] = [[0] * (len(DEFAULT_BUCKETS) + 1), 0.0, 0]
+
+        h[0][bisect_left(DEFAULT_BUCKETS, value)] += 1
+        h[1] += value
+        h[2] += 1
+
+@contextmanager
+def _span(name, labels):
+    t0 = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        inc(f"{name}_errors_total", **labels)
+        raise
+    finally:
+        observe(f"{name}_seconds", time.perf_counter() - t0, **labels)
+
+def span(name: str, **labels):
+    '''
+    Times the block into the {name}_seconds histogram and counts exceptions
+    in {name}_errors_total. Returns a shared no-op context when disabled.
+    '''
+    if not _enabled:
+        return _NULL_SPAN
+    return _span(name, labels)
+
+def _fmt_labels(labels, extra=()):
+    items = list(labels) + list(extra)
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in items) + "}"
+
+def render_prometheus():
+    with _lock:
+        counters = dict(_counters)
+        histograms = {k: (list(v[0]), v[1], v[2]) for k, v in _histograms.items()}
+
+    lines = []
+
+    for name in sorted({n for n, _ in counters}):
+        lines.append(f"# TYPE {PREFIX}{name} counter")
+        for (n, labels), value in sorted(counters.items()):
+            if n == name:
+                lines.append(f"{PREFIX}{name}{_fmt_labels(labels)} {value}")
+
+    for name in sorted({n for n, _ in histograms}):
+        lines.append(f"# TYPE {PREFIX}{name} histogram")
+        for (n, labels), (buckets, total, count) in sorted(histograms.items()):
+            if n != name:
+                continue
+
+            cum = 0
+            for le, c in zip(DEFAULT_BUCKETS + ("+Inf",), buckets):
+                cum += c
+                lines.append(f"{PREFIX}{name}_bucket{_fmt_labels(labels, [('le', le)])} {cum}")
+            lines.append(f"{PREFIX}{name}_sum{_fmt_labels(labels)} {total}")
+            lines.append(f"{PREFIX}{name}_count{_fmt_labels(labels)} {count}")
+
+    return "\n".join(lines) + "\n"
+
+def write_metrics(path: str):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        f.write(render_prometheus())
+    os.replace(tmp, path)
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = render_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def serve_metrics(port: int, host: str = "127.0.0.1"):
+    enable_metrics()
+
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"[METRICS] serving on {host}:{port}/metrics")
+
+    return server
+
+def configure_from_env():
+    if os.getenv(METRICS_ENV, "") not in ("", "0"):
+        enable_metrics()
+
+    path = os.getenv(METRICS_FILE_ENV)
+    if path:
+        enable_metrics()
+        atexit.register(write_metrics, path)
+
+    port = os.getenv(METRICS_PORT_ENV)
+    if port:
+        serve_metrics(int(port))
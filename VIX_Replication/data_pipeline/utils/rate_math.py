@@ -36,6 +36,23 @@ def bounded_cubic_spline(x, y):
 
     return interp
 
+def bounded_cubic_spline_vec(x, y):
+    # Array version of bounded_cubic_spline: same clamping, any shape of t
+    spline = CubicSpline(x, y, bc_type="natural")
+
+    def interp(t):
+        t = np.asarray(t, dtype=float)
+        val = spline(t)
+
+        i = np.clip(np.searchsorted(x, t) - 1, 0, len(x) - 2)
+        lower, upper = y[i], y[i + 1]
+        val = np.clip(val, np.minimum(lower, upper), np.maximum(lower, upper))
+
+        val = np.where(t <= x[0], y[0], val)
+        return np.where(t >= x[-1], y[-1], val)
+
+    return interp
+
 def bey_to_cc_rate(bey):
     apy = (1 + bey / 200) ** 2 - 1
     return np.log(1 + apy)
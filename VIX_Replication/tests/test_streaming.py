@@ -0,0 +1,81 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_pipeline.bench.synthetic import synthetic_chain
+from data_pipeline.compute.streaming import StreamingVIX
+from data_pipeline.compute.vector_calculator import compute_vix_vectorized
+
+M_CM = 30
+R1, R2 = 0.04, 0.041
+
+def _book(df):
+    return {k: (b, a) for k, b, a in zip(df["strike"], df["bid"], df["ask"])}
+
+def _frame(book, cp, dte):
+    rows = [
+        dict(cp=cp, strike=k, bid=b, ask=a, mid=(b + a) / 2, dte=dte)
+        for k, (b, a) in sorted(book.items())
+        if not np.isnan(b)
+    ]
+    return pd.DataFrame(rows)
+
+def _random_update(rng, book, strikes):
+    k = float(rng.choice(strikes))
+    bid, ask = book.get(k, (np.nan, np.nan))
+    u = rng.random()
+
+    if np.isnan(bid) or u < 0.05:
+        # quote (re)appears
+        bid = float(np.round(rng.uniform(0.05, 50.0), 2))
+        return k, bid, bid + 0.1
+    if u < 0.10:
+        # quote disappears
+        return k, np.nan, np.nan
+    if u < 0.20:
+        # zero-bid flip
+        return k, 0.0 if bid > 0 else 0.05, ask
+
+    move = float(np.round(rng.normal(0, 0.05 * max(bid, 0.1)), 2))
+    bid = max(0.0, bid + move)
+    return k, bid, max(ask + move, bid + 0.05)
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_streaming_matches_full_recompute(seed):
+    rng = np.random.default_rng(seed)
+    call_near, put_near, call_next, put_next = synthetic_chain(200, seed=seed)
+    dte = {"near": call_near["dte"].iloc[0], "next": call_next["dte"].iloc[0]}
+
+    stream = StreamingVIX(call_near, put_near, call_next, put_next, M_CM, R1, R2)
+    books = {
+        ("near", "C"): _book(call_near), ("near", "P"): _book(put_near),
+        ("next", "C"): _book(call_next), ("next", "P"): _book(put_next),
+    }
+
+    # only touch strikes near the money so the strips stay valid
+    strikes = {
+        term: np.array(sorted(books[(term, "C")]))[60:140]
+        for term in ("near", "next")
+    }
+
+    checked = 0
+    for _ in range(400):
+        term = "near" if rng.random() < 0.5 else "next"
+        cp = "C" if rng.random() < 0.5 else "P"
+        k, bid, ask = _random_update(rng, books[(term, cp)], strikes[term])
+
+        books[(term, cp)][k] = (bid, ask)
+        stream.update(term, k, cp, bid, ask)
+
+        frames = [_frame(books[(t, c)], c, dte[t]) for t in ("near", "next") for c in ("C", "P")]
+        try:
+            want = compute_vix_vectorized(*frames, date(2024, 1, 2), M_CM, R1, R2)
+        except ValueError:
+            continue
+
+        assert stream.vix == pytest.approx(want["vix"], rel=1e-9)
+        checked += 1
+
+    assert checked > 300
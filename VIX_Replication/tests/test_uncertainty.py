@@ -0,0 +1,42 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+from data_pipeline.bench.synthetic import synthetic_chain
+from data_pipeline.compute.uncertainty import simulate_vix, summarize_draws
+from data_pipeline.compute.vector_calculator import compute_vix_vectorized
+
+M_CM = 30
+R1, R2 = 0.04, 0.041
+
+@pytest.mark.parametrize("n_strikes", [50, 200, 1000])
+def test_bands_bracket_point_estimate(n_strikes):
+    chain = synthetic_chain(n_strikes, seed=0)
+    point = compute_vix_vectorized(*chain, date(2024, 1, 2), M_CM, R1, R2)["vix"]
+
+    vix = simulate_vix(*chain, M_CM, R1, R2, n_draws=2000, seed=0)
+    summary = summarize_draws(vix)
+
+    assert summary["n_draws"] == 2000
+    assert summary["vix_p05"] <= point <= summary["vix_p95"]
+    # bid/ask noise on two-sided quotes moves VIX by hundredths, not points
+    assert summary["vix_p95"] - summary["vix_p05"] < 0.1
+    assert abs(summary["vix_p50"] - point) < 0.01
+    assert np.percentile(vix, 99.9) - point < 0.1
+
+def test_zero_bid_quotes_stay_at_mid():
+    call_near, put_near, call_next, put_next = synthetic_chain(200, seed=0)
+
+    # a zero-bid deep ITM call with a very wide ask must not drive the forward
+    wide = call_near.index[0]
+    call_near = call_near.copy()
+    call_near.loc[wide, ["bid", "ask"]] = [0.0, 5000.0]
+
+    point = compute_vix_vectorized(
+        call_near, put_near, call_next, put_next, date(2024, 1, 2), M_CM, R1, R2)["vix"]
+    summary = summarize_draws(simulate_vix(
+        call_near, put_near, call_next, put_next, M_CM, R1, R2, n_draws=500, seed=1))
+
+    assert summary["vix_p05"] <= point <= summary["vix_p95"]
+    assert summary["vix_p95"] - summary["vix_p05"] < 0.1
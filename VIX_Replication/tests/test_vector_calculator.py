@@ -0,0 +1,33 @@
+from datetime import date
+
+import pytest
+
+from data_pipeline.bench.synthetic import synthetic_chain
+from data_pipeline.compute.calculator import compute_vix_from_dataframes
+from data_pipeline.compute.vector_calculator import compute_vix_vectorized
+
+M_CM = 30
+R1, R2 = 0.04, 0.041
+
+@pytest.mark.parametrize("n_strikes", [50, 200, 1000])
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_pandas_calculator(n_strikes, seed):
+    # synthetic_chain slices one frame like split_chain, so call and put
+    # index labels are disjoint as in loader output
+    chain = synthetic_chain(n_strikes, seed=seed)
+
+    want = compute_vix_from_dataframes(*[df.copy() for df in chain], date(2024, 1, 2), M_CM, R1, R2)
+    got = compute_vix_vectorized(*chain, date(2024, 1, 2), M_CM, R1, R2)
+
+    for key in ("vix", "variance_near", "variance_next"):
+        assert got[key] == pytest.approx(want[key], rel=1e-12)
+
+def test_diagnostics_match():
+    chain = synthetic_chain(200, seed=0)
+    want, got = {}, {}
+
+    compute_vix_from_dataframes(*[df.copy() for df in chain], date(2024, 1, 2), M_CM, R1, R2, diagnostics=want)
+    compute_vix_vectorized(*chain, date(2024, 1, 2), M_CM, R1, R2, diagnostics=got)
+
+    for key in ("forward_near", "forward_next", "K0_near", "K0_next", "n_strikes_near", "n_strikes_next"):
+        assert got[key] == pytest.approx(want[key], rel=1e-12)